@@ -6,7 +6,10 @@ from aiogram.enums import ParseMode
 
 from config import config
 from database.database import init_database
+from database.migrations import run_migrations
+from keyboards.registry import warm_up_keyboards
 from handlers import admin_handlers
+from middlewares.unit_of_work import CommitBeforeRequestMiddleware, UnitOfWorkMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -27,17 +30,28 @@ async def main():
     
     # Initialize database (shared with main bot)
     await init_database()
+    await run_migrations()
     logger.info("Database initialized for admin bot")
     
+    # Build static keyboards before the first update arrives
+    logger.info(f"Prebuilt {warm_up_keyboards()} keyboards")
+    
     # Create bot instance
     admin_bot = Bot(
         token=config.ADMIN_BOT_TOKEN,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
     
+    # Never hold a database transaction across a round trip to Telegram
+    admin_bot.session.middleware(CommitBeforeRequestMiddleware())
+    
     # Create dispatcher
     dp = Dispatcher()
     
+    # One database session per update
+    dp.message.outer_middleware(UnitOfWorkMiddleware())
+    dp.callback_query.outer_middleware(UnitOfWorkMiddleware())
+    
     # Register admin handlers
     dp.include_router(admin_handlers.router)
     
@@ -15,6 +15,20 @@ class Config:
     # Database configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///rental_bot.db")
     
+    # SQLite engine profile: "tuned" (WAL + pragmas + pool) or "default"
+    SQLITE_PROFILE: str = os.getenv("SQLITE_PROFILE", "tuned")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+    SQLITE_POOL_SIZE: int = int(os.getenv("SQLITE_POOL_SIZE", "5"))
+    SQLITE_MAX_OVERFLOW: int = int(os.getenv("SQLITE_MAX_OVERFLOW", "20"))  # extra connections under bursts of updates
+    
+    # User identity cache (per process)
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", "300"))  # seconds
+    USER_CACHE_SYNC_INTERVAL: int = int(os.getenv("USER_CACHE_SYNC_INTERVAL", "5"))  # seconds between polls for users changed elsewhere
+    USER_CACHE_STATS_INTERVAL: int = int(os.getenv("USER_CACHE_STATS_INTERVAL", "600"))  # seconds between stats log lines
+    
     # Payment configuration
     PAYMENT_CARD_NUMBER: str = "9860350140898858"
     PAYMENT_RECIPIENT: str = "BEKCHANOV B."
@@ -30,6 +44,30 @@ class Config:
     # Notification settings
     RENT_REMINDER_DAYS: int = 3  # Days before rent due date to send reminder
     
+    # Telegram send limits for notification sweeps
+    TELEGRAM_GLOBAL_RATE: float = float(os.getenv("TELEGRAM_GLOBAL_RATE", "25"))  # messages per second
+    TELEGRAM_PER_CHAT_INTERVAL: float = float(os.getenv("TELEGRAM_PER_CHAT_INTERVAL", "1.0"))  # seconds
+    TELEGRAM_MAX_CONCURRENCY: int = int(os.getenv("TELEGRAM_MAX_CONCURRENCY", "20"))
+    NOTIFICATION_CHUNK_SIZE: int = int(os.getenv("NOTIFICATION_CHUNK_SIZE", "500"))  # rows per sweep query
+    
+    # Notification outbox delivery
+    OUTBOX_POLL_INTERVAL: int = int(os.getenv("OUTBOX_POLL_INTERVAL", "10"))  # seconds
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "200"))
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+    OUTBOX_BASE_BACKOFF: int = int(os.getenv("OUTBOX_BASE_BACKOFF", "30"))  # seconds, doubled per attempt
+    OUTBOX_MAX_BACKOFF: int = int(os.getenv("OUTBOX_MAX_BACKOFF", "3600"))  # seconds
+    OUTBOX_LEASE_SECONDS: int = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+    OUTBOX_RETENTION_DAYS: int = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+    
+    # Premium expiry
+    PREMIUM_REMINDER_DAYS: int = int(os.getenv("PREMIUM_REMINDER_DAYS", "3"))  # days before expiry
+    PREMIUM_EXPIRY_INTERVAL: int = int(os.getenv("PREMIUM_EXPIRY_INTERVAL", "3600"))  # seconds between downgrades
+    
+    # Scheduler leader election (one worker runs the scheduled jobs)
+    LEADER_LEASE_SECONDS: int = int(os.getenv("LEADER_LEASE_SECONDS", "60"))
+    SCHEDULER_MISFIRE_GRACE: int = int(os.getenv("SCHEDULER_MISFIRE_GRACE", "3600"))  # seconds
+    SCHEDULER_CATCH_UP_DAYS: int = int(os.getenv("SCHEDULER_CATCH_UP_DAYS", "3"))  # missed days replayed on startup
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate required configuration"""
@@ -0,0 +1,104 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a fixed time-to-live"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return cached value or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._on_remove(key, value)
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value, evicting the least recently used entry when full"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        
+        while len(self._entries) > self.maxsize:
+            evicted_key, (_, evicted_value) = self._entries.popitem(last=False)
+            self._on_remove(evicted_key, evicted_value)
+            self.evictions += 1
+    
+    def _on_remove(self, key: Hashable, value: Any) -> None:
+        """Hook called when an entry expires or is evicted"""
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+    
+    def stats(self) -> dict:
+        """Get hit/miss/eviction counters"""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+class UserCache(TTLCache):
+    """User identity cache keyed by telegram ID
+    
+    Entries are detached User rows, so only scalar columns may be read from
+    them. Each bot process keeps its own cache; writes made by another
+    process are picked up by UserCacheSync polling users.updated_at.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        super().__init__(maxsize, ttl)
+        self._telegram_ids: dict[int, int] = {}
+    
+    def put(self, user) -> None:
+        """Store (or refresh) a user row"""
+        if user is None:
+            return
+        self._telegram_ids[user.id] = user.telegram_id
+        self.set(user.telegram_id, user)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a user by telegram ID"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._telegram_ids.pop(entry[1].id, None)
+    
+    def invalidate_user_id(self, user_id: int) -> None:
+        """Drop a user by database ID"""
+        telegram_id = self._telegram_ids.pop(user_id, None)
+        if telegram_id is not None:
+            self._entries.pop(telegram_id, None)
+    
+    def _on_remove(self, key: Hashable, value: Any) -> None:
+        # Keep the reverse index bounded together with the entries
+        if self._telegram_ids.get(value.id) == key:
+            del self._telegram_ids[value.id]
+    
+    def clear(self) -> None:
+        super().clear()
+        self._telegram_ids.clear()
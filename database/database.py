@@ -1,11 +1,14 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from contextvars import ContextVar
+from typing import AsyncGenerator, Optional
 import asyncio
 from config import config
-from database.models import Base
+from database.models import Base, User
+from database.cache import TTLCache, UserCache
 
 # Convert sync DATABASE_URL to async if needed
 database_url = config.DATABASE_URL
@@ -21,19 +24,74 @@ elif database_url.startswith("postgresql://"):
 else:
     async_database_url = database_url
 
+# In-memory databases are per connection and cannot be pooled or use WAL
+is_file_sqlite = (
+    async_database_url.startswith("sqlite")
+    and ":memory:" not in async_database_url
+    and not async_database_url.rstrip("/").endswith(":")
+)
+use_tuned_sqlite = is_file_sqlite and config.SQLITE_PROFILE == "tuned"
+
+if use_tuned_sqlite:
+    # WAL lets readers run alongside the single writer, so a small pool helps;
+    # overflow covers bursts of concurrent updates and scheduler jobs, which
+    # share this pool. SQLite connections never go stale, so no pre-ping or recycling
+    engine_options = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": config.SQLITE_POOL_SIZE,
+        "max_overflow": config.SQLITE_MAX_OVERFLOW,
+        "pool_timeout": 30
+    }
+else:
+    engine_options = {
+        "pool_pre_ping": True,
+        "pool_recycle": 3600
+    }
+
 # Create async engine with connection pooling
 engine = create_async_engine(
     async_database_url, 
     echo=False,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    connect_args={"server_settings": {"jit": "off"}} if "postgresql" in async_database_url else {}
+    connect_args={"server_settings": {"jit": "off"}} if "postgresql" in async_database_url else {},
+    **engine_options
 )
+
+if use_tuned_sqlite:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        """Apply the tuned SQLite profile to every new connection"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA cache_size=-{config.SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={config.SQLITE_MMAP_SIZE}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Per-process cache in front of get_user_by_telegram_id
+user_cache = UserCache(maxsize=config.USER_CACHE_SIZE, ttl=config.USER_CACHE_TTL)
+
+# Total user count shown in the admin users list
+user_count_cache = TTLCache(maxsize=1, ttl=60)
+
+# Session of the unit of work (one Telegram update) running in this context
+_current_session: ContextVar[Optional[AsyncSession]] = ContextVar("current_session", default=None)
+
 @asynccontextmanager
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session with error handling"""
+async def get_session(session: Optional[AsyncSession] = None) -> AsyncGenerator[AsyncSession, None]:
+    """Get database session with error handling
+    
+    An explicitly passed session or the current unit of work's session is
+    reused as is; it is committed and closed by whoever opened it.
+    """
+    shared = session or _current_session.get()
+    if shared is not None:
+        yield shared
+        return
+    
     session = None
     try:
         session = async_session_maker()
@@ -41,6 +99,7 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         await session.commit()
     except Exception as e:
         if session:
+            session.expunge_all()
             await session.rollback()
         print(f"Database session error: {e}")
         raise
@@ -48,6 +107,59 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         if session:
             await session.close()
 
+@asynccontextmanager
+async def unit_of_work() -> AsyncGenerator[AsyncSession, None]:
+    """Share one session across all get_session() calls in this context
+    
+    Committed on exit, and earlier by commit_unit_of_work() before each
+    Telegram API call.
+    """
+    session = async_session_maker()
+    token = _current_session.set(session)
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        # Cached rows written in this unit of work were never committed
+        for telegram_id in session.info.get("cached_users", ()):
+            user_cache.invalidate(telegram_id)
+        user_count_cache.clear()
+        # Rollback expires every attached row, including ones user_cache serves
+        session.expunge_all()
+        await session.rollback()
+        raise
+    finally:
+        _current_session.reset(token)
+        await session.close()
+
+async def commit_unit_of_work() -> None:
+    """Commit the current unit of work early, releasing its connection and locks
+    
+    The session stays in use for the rest of the update; the next
+    get_session() call starts a new transaction on it.
+    """
+    session = _current_session.get()
+    if session is None or not session.in_transaction():
+        return
+    
+    await session.commit()
+    session.info.pop("cached_users", None)
+
+def cache_user(session: AsyncSession, user: User) -> None:
+    """Write a user row through to user_cache, remembering it for rollback"""
+    if user is None:
+        return
+    user_cache.put(user)
+    session.info.setdefault("cached_users", set()).add(user.telegram_id)
+
+def dialect_insert(model):
+    """Get an INSERT construct supporting ON CONFLICT for the active dialect"""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_specific_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_specific_insert
+    return dialect_specific_insert(model)
+
 async def init_database():
     """Initialize database tables"""
     try:
@@ -58,64 +170,98 @@ async def init_database():
         print(f"Database tables already exist or initialization skipped: {e}")
 
 # Database service functions
-from database.models import User, Property, Tenant, Subscription, PremiumRequest, AdminSession, AdminConfig
-from sqlalchemy import select, update, delete
-from datetime import datetime, timedelta
+from database.models import (
+    User, Property, Tenant, Subscription, PremiumRequest, AdminSession, AdminConfig,
+    NotificationOutbox, NotificationLedger, ScheduledJobRun, TenantPaymentPeriod, PremiumEvent
+)
+from sqlalchemy import select, insert, update, delete, func, case, literal, DateTime
+from sqlalchemy.orm import joinedload
+from datetime import date, datetime, timedelta
+from utils.helpers import first_due_date, following_due_date
 
 class DatabaseService:
     @staticmethod
-    async def get_user_by_telegram_id(telegram_id: int) -> User:
-        """Get user by telegram ID"""
-        async with get_session() as session:
+    async def get_user_by_telegram_id(telegram_id: int, session: AsyncSession = None) -> User:
+        """Get user by telegram ID (served from user_cache when possible)"""
+        user = user_cache.get(telegram_id)
+        if user is not None:
+            return user
+        
+        async with get_session(session) as session:
             result = await session.execute(
                 select(User).where(User.telegram_id == telegram_id)
             )
-            return result.scalar_one_or_none()
+            user = result.scalar_one_or_none()
+            user_cache.put(user)
+            return user
+    
+    @staticmethod
+    def get_user_cache_stats() -> dict:
+        """Get user cache hit/miss/eviction counters"""
+        return user_cache.stats()
+    
+    @staticmethod
+    async def get_users_changed_since(since: datetime, session: AsyncSession = None) -> list[int]:
+        """Get telegram IDs of users updated at or after the given time"""
+        async with get_session(session) as session:
+            result = await session.execute(
+                select(User.telegram_id).where(User.updated_at >= since)
+            )
+            return list(result.scalars().all())
+    
+    @staticmethod
+    async def is_premium_active(user_id: int, session: AsyncSession = None) -> bool:
+        """Read a user's premium flag straight from the database, bypassing user_cache"""
+        async with get_session(session) as session:
+            return bool(await session.scalar(
+                select(User.is_premium).where(User.id == user_id)
+            ))
     
     @staticmethod
-    async def get_user_by_id(user_id: int) -> User:
+    async def get_user_by_id(user_id: int, session: AsyncSession = None) -> User:
         """Get user by ID"""
-        async with get_session() as session:
+        async with get_session(session) as session:
             result = await session.execute(
                 select(User).where(User.id == user_id)
             )
             return result.scalar_one_or_none()
     
     @staticmethod
-    async def create_user(telegram_id: int, language: str = "uz") -> User:
+    async def create_user(telegram_id: int, language: str = "uz", session: AsyncSession = None) -> User:
         """Create new user"""
-        async with get_session() as session:
-            user = User(telegram_id=telegram_id, language=language)
-            session.add(user)
-            await session.commit()
-            await session.refresh(user)
+        async with get_session(session) as session:
+            result = await session.scalars(
+                insert(User)
+                .values(telegram_id=telegram_id, language=language)
+                .returning(User)
+            )
+            user = result.one()
+            cache_user(session, user)
+            user_count_cache.clear()
             return user
     
     @staticmethod
-    async def update_user(telegram_id: int = None, user_id: int = None, **kwargs) -> User:
+    async def update_user(telegram_id: int = None, user_id: int = None, session: AsyncSession = None, **kwargs) -> User:
         """Update user information"""
-        async with get_session() as session:
+        async with get_session(session) as session:
             if telegram_id:
-                await session.execute(
-                    update(User).where(User.telegram_id == telegram_id).values(**kwargs)
-                )
-                await session.commit()
-                return await DatabaseService.get_user_by_telegram_id(telegram_id)
+                condition = User.telegram_id == telegram_id
             elif user_id:
-                await session.execute(
-                    update(User).where(User.id == user_id).values(**kwargs)
-                )
-                await session.commit()
-                # Get user by ID
-                result = await session.execute(select(User).where(User.id == user_id))
-                return result.scalar_one()
+                condition = User.id == user_id
             else:
                 raise ValueError("Either telegram_id or user_id must be provided")
+            
+            result = await session.scalars(
+                update(User).where(condition).values(**kwargs).returning(User)
+            )
+            user = result.one()
+            cache_user(session, user)
+            return user
     
     @staticmethod
-    async def get_user_properties(user_id: int) -> list[Property]:
+    async def get_user_properties(user_id: int, session: AsyncSession = None) -> list[Property]:
         """Get all properties for a user"""
-        async with get_session() as session:
+        async with get_session(session) as session:
             result = await session.execute(
                 select(Property).where(Property.owner_id == user_id)
             )
@@ -123,26 +269,27 @@ class DatabaseService:
     
     @staticmethod
     async def create_property(owner_id: int, address: str, area_sqm: float, 
-                            rooms_count: int, monthly_rent: float, currency: str = "UZS") -> Property:
+                            rooms_count: int, monthly_rent: float, currency: str = "UZS", session: AsyncSession = None) -> Property:
         """Create new property"""
-        async with get_session() as session:
-            property_obj = Property(
-                owner_id=owner_id,
-                address=address,
-                area_sqm=area_sqm,
-                rooms_count=rooms_count,
-                monthly_rent=monthly_rent,
-                currency=currency
-            )
-            session.add(property_obj)
-            await session.commit()
-            await session.refresh(property_obj)
-            return property_obj
-    
-    @staticmethod
-    async def get_user_tenants(user_id: int) -> list[Tenant]:
+        async with get_session(session) as session:
+            result = await session.scalars(
+                insert(Property)
+                .values(
+                    owner_id=owner_id,
+                    address=address,
+                    area_sqm=area_sqm,
+                    rooms_count=rooms_count,
+                    monthly_rent=monthly_rent,
+                    currency=currency
+                )
+                .returning(Property)
+            )
+            return result.one()
+    
+    @staticmethod
+    async def get_user_tenants(user_id: int, session: AsyncSession = None) -> list[Tenant]:
         """Get all tenants for a user"""
-        async with get_session() as session:
+        async with get_session(session) as session:
             result = await session.execute(
                 select(Tenant).where(Tenant.landlord_id == user_id)
             )
@@ -151,78 +298,92 @@ class DatabaseService:
     @staticmethod
     async def create_tenant(landlord_id: int, property_id: int, full_name: str,
                           passport_series: str, passport_number: str, 
-                          move_in_date: datetime, rent_due_date: int) -> Tenant:
+                          move_in_date: datetime, rent_due_date: int, session: AsyncSession = None) -> Tenant:
         """Create new tenant"""
-        async with get_session() as session:
-            # Get property rent amount
-            property_result = await session.execute(
-                select(Property).where(Property.id == property_id)
-            )
-            property_obj = property_result.scalar_one()
+        async with get_session(session) as session:
+            first_due = first_due_date(rent_due_date, max(move_in_date, datetime.now().replace(day=1)))
             
-            tenant = Tenant(
-                landlord_id=landlord_id,
-                property_id=property_id,
-                full_name=full_name,
-                passport_series=passport_series,
-                passport_number=passport_number,
-                move_in_date=move_in_date,
-                rent_due_date=rent_due_date,
-                amount_due=property_obj.monthly_rent
-            )
-            session.add(tenant)
-            await session.commit()
-            await session.refresh(tenant)
-            return tenant
-    
-    @staticmethod
-    async def create_premium_request(user_id: int, subscription_type: str, amount: float) -> PremiumRequest:
+            # Amount due is copied from the property's rent inside the INSERT
+            result = await session.scalars(
+                insert(Tenant)
+                .values(
+                    landlord_id=landlord_id,
+                    property_id=property_id,
+                    full_name=full_name,
+                    passport_series=passport_series,
+                    passport_number=passport_number,
+                    move_in_date=move_in_date,
+                    rent_due_date=rent_due_date,
+                    next_due_at=first_due,
+                    period_due_at=first_due,
+                    next_period_due_at=following_due_date(rent_due_date, first_due),
+                    amount_due=select(Property.monthly_rent)
+                    .where(Property.id == property_id)
+                    .scalar_subquery()
+                )
+                .returning(Tenant)
+            )
+            return result.one()
+    
+    @staticmethod
+    async def create_premium_request(user_id: int, subscription_type: str, amount: float, session: AsyncSession = None) -> PremiumRequest:
         """Create premium request"""
-        async with get_session() as session:
-            request = PremiumRequest(
-                user_id=user_id,
-                subscription_type=subscription_type,
-                amount=amount
+        async with get_session(session) as session:
+            result = await session.scalars(
+                insert(PremiumRequest)
+                .values(
+                    user_id=user_id,
+                    subscription_type=subscription_type,
+                    amount=amount
+                )
+                .returning(PremiumRequest)
             )
-            session.add(request)
-            await session.commit()
-            await session.refresh(request)
-            return request
+            return result.one()
     
     @staticmethod
-    async def get_pending_premium_requests() -> list[PremiumRequest]:
+    async def get_pending_premium_requests(session: AsyncSession = None) -> list[PremiumRequest]:
         """Get all pending premium requests"""
-        async with get_session() as session:
+        async with get_session(session) as session:
             result = await session.execute(
-                select(PremiumRequest).where(PremiumRequest.status == "pending")
+                select(PremiumRequest)
+                .options(joinedload(PremiumRequest.user))
+                .where(PremiumRequest.status == "pending")
             )
             return list(result.scalars().all())
     
     @staticmethod
-    async def approve_premium_request(request_id: int) -> bool:
+    async def get_premium_request_by_id(request_id: int, session: AsyncSession = None) -> PremiumRequest:
+        """Get premium request by ID with its user loaded"""
+        async with get_session(session) as session:
+            result = await session.execute(
+                select(PremiumRequest)
+                .options(joinedload(PremiumRequest.user))
+                .where(PremiumRequest.id == request_id)
+            )
+            return result.scalar_one_or_none()
+    
+    @staticmethod
+    async def approve_premium_request(request_id: int, session: AsyncSession = None) -> bool:
         """Approve premium request and activate user premium"""
-        async with get_session() as session:
-            # Get the request
-            request_result = await session.execute(
-                select(PremiumRequest).where(PremiumRequest.id == request_id)
+        async with get_session(session) as session:
+            # Mark the request approved (only once) and read what we need back
+            now = datetime.utcnow()
+            result = await session.execute(
+                update(PremiumRequest)
+                .where(PremiumRequest.id == request_id, PremiumRequest.status == "pending")
+                .values(status="approved", processed_at=now)
+                .returning(PremiumRequest.user_id, PremiumRequest.subscription_type)
             )
-            request = request_result.scalar_one_or_none()
+            request = result.one_or_none()
             
             if not request:
                 return False
             
-            # Update request status
-            await session.execute(
-                update(PremiumRequest)
-                .where(PremiumRequest.id == request_id)
-                .values(status="approved", processed_at=datetime.utcnow())
-            )
-            
             # Calculate premium expiry
             if request.subscription_type == "monthly":
-                expires_at = datetime.utcnow() + timedelta(days=30)
+                expires_at = now + timedelta(days=30)
             else:  # yearly
-                expires_at = datetime.utcnow() + timedelta(days=365)
+                expires_at = now + timedelta(days=365)
             
             # Update user premium status
             await session.execute(
@@ -231,70 +392,180 @@ class DatabaseService:
                 .values(is_premium=True, premium_expires_at=expires_at)
             )
             
-            await session.commit()
+            user_cache.invalidate_user_id(request.user_id)
             return True
     
     @staticmethod
-    async def get_all_users() -> list[User]:
+    async def expire_premium_users(now: datetime, session: AsyncSession = None) -> list[int]:
+        """Downgrade every user whose premium has expired and record the transitions"""
+        async with get_session(session) as session:
+            result = await session.execute(
+                update(User)
+                .where(User.is_premium == True, User.premium_expires_at < now)
+                .values(is_premium=False)
+                .returning(User.id, User.telegram_id, User.premium_expires_at)
+            )
+            expired = result.all()
+            if not expired:
+                return []
+            
+            await session.execute(
+                insert(PremiumEvent),
+                [
+                    {"user_id": row.id, "event": "expired", "premium_expires_at": row.premium_expires_at, "created_at": now}
+                    for row in expired
+                ]
+            )
+            
+            for row in expired:
+                user_cache.invalidate(row.telegram_id)
+            return [row.id for row in expired]
+    
+    @staticmethod
+    async def get_expiring_premium_users(until: datetime, after_id: int = 0, limit: int = 500,
+                                         session: AsyncSession = None) -> list:
+        """Get premium users expiring before the given time, keyset-paged by ID"""
+        async with get_session(session) as session:
+            result = await session.execute(
+                select(User.id, User.telegram_id, User.language, User.premium_expires_at)
+                .where(
+                    User.is_premium == True,
+                    User.premium_expires_at < until,
+                    User.is_reachable == True,
+                    User.id > after_id
+                )
+                .order_by(User.id)
+                .limit(limit)
+            )
+            return result.all()
+    
+    @staticmethod
+    async def mark_chats_unreachable(telegram_ids: list[int], session: AsyncSession = None) -> list[int]:
+        """Flag users who blocked the bot and drop their queued notifications"""
+        if not telegram_ids:
+            return []
+        
+        async with get_session(session) as session:
+            now = datetime.utcnow()
+            result = await session.execute(
+                update(User)
+                .where(User.telegram_id.in_(telegram_ids), User.is_reachable == True)
+                .values(is_reachable=False, unreachable_since=now)
+                .returning(User.telegram_id)
+            )
+            marked = list(result.scalars().all())
+            
+            await session.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.chat_id.in_(telegram_ids), NotificationOutbox.status == "pending")
+                .values(status="dead", last_error="chat unreachable")
+            )
+            
+            for telegram_id in marked:
+                user_cache.invalidate(telegram_id)
+            return marked
+    
+    @staticmethod
+    async def get_all_users(session: AsyncSession = None) -> list[User]:
         """Get all users"""
-        async with get_session() as session:
+        async with get_session(session) as session:
             result = await session.execute(select(User))
             return list(result.scalars().all())
     
     @staticmethod
-    async def get_user_stats() -> dict:
-        """Get user statistics"""
-        async with get_session() as session:
-            # Total users
-            total_result = await session.execute(select(User))
-            total_users = len(total_result.scalars().all())
+    async def get_users_page(after_id: int = None, before_id: int = None,
+                             per_page: int = 10, session: AsyncSession = None) -> tuple[list[User], bool, bool]:
+        """Get one page of users ordered by ID using a keyset on users.id
+        
+        Returns (users, has_previous, has_next). Pass the last ID of the
+        current page as after_id to go forward, or its first ID as before_id
+        to go back.
+        """
+        async with get_session(session) as session:
+            query = select(User).limit(per_page + 1)
             
-            # Premium users
-            premium_result = await session.execute(
-                select(User).where(User.is_premium == True)
-            )
-            premium_users = len(premium_result.scalars().all())
+            if before_id is not None:
+                result = await session.execute(
+                    query.where(User.id < before_id).order_by(User.id.desc())
+                )
+                users = list(result.scalars().all())
+                has_previous = len(users) > per_page
+                return list(reversed(users[:per_page])), has_previous, True
             
-            # Recent users (last 7 days)
-            week_ago = datetime.utcnow() - timedelta(days=7)
-            recent_result = await session.execute(
-                select(User).where(User.created_at >= week_ago)
-            )
-            recent_users = len(recent_result.scalars().all())
+            if after_id is not None:
+                query = query.where(User.id > after_id)
             
-            return {
-                "total_users": total_users,
-                "premium_users": premium_users,
-                "recent_users": recent_users
-            }
+            result = await session.execute(query.order_by(User.id))
+            users = list(result.scalars().all())
+            return users[:per_page], after_id is not None, len(users) > per_page
+    
+    @staticmethod
+    async def count_users(use_cache: bool = True, session: AsyncSession = None) -> int:
+        """Get total number of users"""
+        if use_cache:
+            total = user_count_cache.get("total")
+            if total is not None:
+                return total
+        
+        async with get_session(session) as session:
+            result = await session.execute(select(func.count(User.id)))
+            total = result.scalar_one()
+            user_count_cache.set("total", total)
+            return total
     
     @staticmethod
-    async def authenticate_admin(telegram_id: int) -> bool:
+    async def get_user_stats(session: AsyncSession = None) -> dict:
+        """Get user and platform statistics in a single aggregate query"""
+        async with get_session(session) as session:
+            now = datetime.utcnow()
+            week_ago = now - timedelta(days=7)
+            month_start = datetime(now.year, now.month, 1)
+            
+            # Premium approvals are the only recorded subscription payments
+            result = await session.execute(
+                select(
+                    func.count(User.id).label("total_users"),
+                    func.count(User.id).filter(User.is_premium == True).label("premium_users"),
+                    func.count(User.id).filter(User.created_at >= week_ago).label("recent_users"),
+                    select(func.count(Property.id)).scalar_subquery().label("total_properties"),
+                    select(func.count(Tenant.id)).scalar_subquery().label("total_tenants"),
+                    select(func.count(Tenant.id).filter(Tenant.payment_status == "overdue"))
+                    .scalar_subquery().label("overdue_tenants"),
+                    select(func.count(PremiumRequest.id).filter(PremiumRequest.status == "pending"))
+                    .scalar_subquery().label("pending_premium_requests"),
+                    select(
+                        func.coalesce(
+                            func.sum(PremiumRequest.amount).filter(
+                                PremiumRequest.status == "approved",
+                                PremiumRequest.processed_at >= month_start
+                            ),
+                            0
+                        )
+                    ).scalar_subquery().label("monthly_revenue")
+                ).select_from(User)
+            )
+            return dict(result.one()._mapping)
+    
+    @staticmethod
+    async def authenticate_admin(telegram_id: int, session: AsyncSession = None) -> bool:
         """Check if admin is authenticated"""
-        async with get_session() as session:
+        async with get_session(session) as session:
+            # Touch last activity and check the session exists in one statement
             result = await session.execute(
-                select(AdminSession).where(
+                update(AdminSession)
+                .where(
                     AdminSession.telegram_id == telegram_id,
                     AdminSession.is_authenticated == True
                 )
+                .values(last_activity=datetime.utcnow())
+                .returning(AdminSession.id)
             )
-            session_obj = result.scalar_one_or_none()
-            
-            if session_obj:
-                # Update last activity
-                await session.execute(
-                    update(AdminSession)
-                    .where(AdminSession.id == session_obj.id)
-                    .values(last_activity=datetime.utcnow())
-                )
-                await session.commit()
-                return True
-            return False
+            return result.first() is not None
     
     @staticmethod
-    async def create_admin_session(telegram_id: int) -> None:
+    async def create_admin_session(telegram_id: int, session: AsyncSession = None) -> None:
         """Create admin session"""
-        async with get_session() as session:
+        async with get_session(session) as session:
             # Remove old sessions
             await session.execute(
                 delete(AdminSession).where(AdminSession.telegram_id == telegram_id)
@@ -303,36 +574,26 @@ class DatabaseService:
             # Create new session
             admin_session = AdminSession(telegram_id=telegram_id, is_authenticated=True)
             session.add(admin_session)
-            await session.commit()
     
     @staticmethod
-    async def set_admin_config(key: str, value: str) -> None:
+    async def set_admin_config(key: str, value: str, session: AsyncSession = None) -> None:
         """Set admin configuration value"""
-        async with get_session() as session:
-            # Check if config exists
-            result = await session.execute(
-                select(AdminConfig).where(AdminConfig.key == key)
+        async with get_session(session) as session:
+            now = datetime.utcnow()
+            statement = dialect_insert(AdminConfig).values(
+                key=key, value=value, created_at=now, updated_at=now
             )
-            config_obj = result.scalar_one_or_none()
-            
-            if config_obj:
-                # Update existing
-                await session.execute(
-                    update(AdminConfig)
-                    .where(AdminConfig.key == key)
-                    .values(value=value, updated_at=datetime.utcnow())
+            await session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[AdminConfig.key],
+                    set_={"value": value, "updated_at": now}
                 )
-            else:
-                # Create new
-                config_obj = AdminConfig(key=key, value=value)
-                session.add(config_obj)
-            
-            await session.commit()
+            )
     
     @staticmethod
-    async def get_admin_config(key: str, default: str = None) -> str:
+    async def get_admin_config(key: str, default: str = None, session: AsyncSession = None) -> str:
         """Get admin configuration value"""
-        async with get_session() as session:
+        async with get_session(session) as session:
             result = await session.execute(
                 select(AdminConfig).where(AdminConfig.key == key)
             )
@@ -343,61 +604,338 @@ class DatabaseService:
             return default
     
     @staticmethod
-    async def get_tenants_with_properties(user_id: int) -> list:
-        """Get all tenants for a user with property information"""
-        async with get_session() as session:
+    async def get_tenants_with_properties(user_id: int, offset: int = 0, limit: int = None,
+                                          session: AsyncSession = None) -> list:
+        """Get a user's tenants with property information, optionally one page of them"""
+        async with get_session(session) as session:
             result = await session.execute(
                 select(Tenant, Property)
                 .join(Property, Tenant.property_id == Property.id)
                 .where(Tenant.landlord_id == user_id)
+                .order_by(Tenant.id)
+                .offset(offset)
+                .limit(limit)
             )
             return list(result.all())
     
     @staticmethod
-    async def update_tenant_payment_status(tenant_id: int, status: str, amount_paid: float = None) -> bool:
+    async def count_user_tenants(user_id: int, session: AsyncSession = None) -> int:
+        """Count a user's tenants"""
+        async with get_session(session) as session:
+            return await session.scalar(
+                select(func.count(Tenant.id)).where(Tenant.landlord_id == user_id)
+            )
+    
+    @staticmethod
+    async def update_tenant_payment_status(tenant_id: int, status: str, amount_paid: float = None, session: AsyncSession = None) -> bool:
         """Update tenant payment status"""
-        async with get_session() as session:
+        async with get_session(session) as session:
+            now = datetime.utcnow()
             update_values = {
                 "payment_status": status,
-                "last_payment_date": datetime.utcnow()
+                "last_payment_date": now,
+                "status_changed_at": now,
+                "overdue_since": func.coalesce(Tenant.overdue_since, now) if status == "overdue" else None
             }
             
+            # Without an amount, "paid" settles the period and anything else
+            # undoes an earlier (possibly mistaken) full payment
             if amount_paid is not None:
                 update_values["amount_paid"] = amount_paid
+            elif status == "paid":
+                update_values["amount_paid"] = Tenant.amount_due
+            else:
+                update_values["amount_paid"] = 0.0
             
-            await session.execute(
+            # A paid period moves the due date to the next period; anything else
+            # keeps (or restores) the open period's due date, or an older one
+            if status == "paid":
+                update_values["next_due_at"] = Tenant.next_period_due_at
+            else:
+                update_values["next_due_at"] = case(
+                    (Tenant.next_due_at < Tenant.period_due_at, Tenant.next_due_at),
+                    else_=Tenant.period_due_at
+                )
+            
+            result = await session.execute(
                 update(Tenant)
                 .where(Tenant.id == tenant_id)
                 .values(**update_values)
+                .returning(Tenant.id)
             )
-            await session.commit()
-            return True
+            return result.first() is not None
+    
+    @staticmethod
+    async def mark_tenants_paid(landlord_id: int, tenant_ids: list[int] = None,
+                                session: AsyncSession = None) -> list[int]:
+        """Mark all (or the given) tenants of a landlord as fully paid in one statement"""
+        async with get_session(session) as session:
+            query = update(Tenant).where(Tenant.landlord_id == landlord_id)
+            if tenant_ids is not None:
+                if not tenant_ids:
+                    return []
+                query = query.where(Tenant.id.in_(tenant_ids))
+            
+            now = datetime.utcnow()
+            result = await session.execute(
+                query.values(
+                    payment_status="paid",
+                    amount_paid=Tenant.amount_due,
+                    next_due_at=Tenant.next_period_due_at,
+                    last_payment_date=now,
+                    status_changed_at=now,
+                    overdue_since=None
+                )
+                .returning(Tenant.id)
+            )
+            return list(result.scalars().all())
     
     @staticmethod
-    async def get_overdue_tenants() -> list[Tenant]:
+    async def get_overdue_tenants(session: AsyncSession = None) -> list[Tenant]:
         """Get all tenants with overdue payments"""
-        async with get_session() as session:
+        async with get_session(session) as session:
             # Get tenants who haven't paid this month
             current_date = datetime.utcnow()
             result = await session.execute(
                 select(Tenant)
                 .where(Tenant.payment_status == "overdue")
-                .order_by(Tenant.rent_due_date)
+                .order_by(Tenant.next_due_at)
             )
             return list(result.scalars().all())
     
     @staticmethod
-    async def get_upcoming_rent_due_tenants(days_ahead: int = 3) -> list[Tenant]:
+    async def get_upcoming_rent_due_tenants(days_ahead: int = 3, session: AsyncSession = None) -> list[Tenant]:
         """Get tenants whose rent is due in specified days"""
-        async with get_session() as session:
-            current_date = datetime.utcnow()
-            target_day = (current_date + timedelta(days=days_ahead)).day
+        async with get_session(session) as session:
+            target_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=days_ahead)
             
             result = await session.execute(
                 select(Tenant)
                 .where(
-                    Tenant.rent_due_date == target_day,
+                    Tenant.next_due_at >= target_date,
+                    Tenant.next_due_at < target_date + timedelta(days=1),
                     Tenant.payment_status.in_(["pending", "partial"])
                 )
             )
             return list(result.scalars().all())
+    
+    @staticmethod
+    async def roll_over_billing_bucket(rent_due_day: int, due_at: datetime, session: AsyncSession = None) -> int:
+        """Archive the open period of every tenant due on a day and open the next one"""
+        # Only rows still before due_at match, so re-running a bucket is a no-op
+        conditions = (
+            Tenant.rent_due_date == rent_due_day,
+            Tenant.period_due_at < due_at
+        )
+        balance = Tenant.amount_due - Tenant.amount_paid
+        in_arrears = balance > 0
+        
+        async with get_session(session) as session:
+            statement = dialect_insert(TenantPaymentPeriod).from_select(
+                ["tenant_id", "due_at", "payment_status", "amount_due", "amount_paid", "paid_at", "closed_at"],
+                select(
+                    Tenant.id,
+                    Tenant.period_due_at,
+                    Tenant.payment_status,
+                    Tenant.amount_due,
+                    Tenant.amount_paid,
+                    Tenant.last_payment_date,
+                    literal(datetime.utcnow(), DateTime)
+                )
+                .where(*conditions)
+            )
+            await session.execute(
+                statement.on_conflict_do_nothing(index_elements=["tenant_id", "due_at"])
+            )
+            
+            # An unpaid balance is carried forward and keeps its original due date
+            result = await session.execute(
+                update(Tenant)
+                .where(*conditions)
+                .values(
+                    next_due_at=case((in_arrears, Tenant.next_due_at), else_=due_at),
+                    period_due_at=due_at,
+                    next_period_due_at=following_due_date(rent_due_day, due_at),
+                    payment_status="pending",
+                    amount_due=select(Property.monthly_rent)
+                    .where(Property.id == Tenant.property_id)
+                    .scalar_subquery() + case((in_arrears, balance), else_=0.0),
+                    amount_paid=0.0,
+                    overdue_since=case((in_arrears, Tenant.overdue_since), else_=None),
+                    status_changed_at=datetime.utcnow()
+                )
+            )
+            return result.rowcount
+    
+    @staticmethod
+    async def mark_overdue_tenants(today: datetime, session: AsyncSession = None) -> int:
+        """Flag pending and partially paid tenants past their due date as overdue"""
+        day_start = today.replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        async with get_session(session) as session:
+            now = datetime.utcnow()
+            result = await session.execute(
+                update(Tenant)
+                .where(
+                    Tenant.next_due_at < day_start,
+                    Tenant.payment_status.in_(["pending", "partial"])
+                )
+                .values(
+                    payment_status="overdue",
+                    status_changed_at=now,
+                    overdue_since=func.coalesce(Tenant.overdue_since, now)
+                )
+            )
+            return result.rowcount
+    
+    @staticmethod
+    async def enqueue_notifications(messages: list[tuple[int, str, str]], session: AsyncSession = None) -> None:
+        """Queue (chat_id, kind, text) messages in the outbox with one bulk INSERT"""
+        if not messages:
+            return
+        
+        async with get_session(session) as session:
+            now = datetime.utcnow()
+            await session.execute(
+                insert(NotificationOutbox),
+                [
+                    {
+                        "chat_id": chat_id,
+                        "kind": kind,
+                        "text": text,
+                        "status": "pending",
+                        "attempts": 0,
+                        "next_attempt_at": now,
+                        "created_at": now
+                    }
+                    for chat_id, kind, text in messages
+                ]
+            )
+    
+    @staticmethod
+    async def claim_notifications(limit: int, lease_seconds: int,
+                                  session: AsyncSession = None) -> list:
+        """Claim due outbox messages for delivery
+        
+        Claimed rows move to "sending" with next_attempt_at as the lease
+        expiry, so rows left behind by a crashed worker are claimed again.
+        """
+        async with get_session(session) as session:
+            now = datetime.utcnow()
+            is_due = (
+                NotificationOutbox.status.in_(["pending", "sending"]),
+                NotificationOutbox.next_attempt_at <= now
+            )
+            due_ids = (
+                select(NotificationOutbox.id)
+                .where(*is_due)
+                .order_by(NotificationOutbox.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            result = await session.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id.in_(due_ids.scalar_subquery()), *is_due)
+                .values(status="sending", next_attempt_at=now + timedelta(seconds=lease_seconds))
+                .returning(
+                    NotificationOutbox.id,
+                    NotificationOutbox.chat_id,
+                    NotificationOutbox.kind,
+                    NotificationOutbox.text,
+                    NotificationOutbox.attempts
+                )
+            )
+            return list(result.all())
+    
+    @staticmethod
+    async def mark_notifications_sent(outbox_ids: list[int], session: AsyncSession = None) -> None:
+        """Mark delivered outbox messages as sent"""
+        if not outbox_ids:
+            return
+        
+        async with get_session(session) as session:
+            await session.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id.in_(outbox_ids))
+                .values(status="sent", sent_at=datetime.utcnow(), last_error=None)
+            )
+    
+    @staticmethod
+    async def mark_notifications_failed(failures: list[dict], session: AsyncSession = None) -> None:
+        """Record failed deliveries
+        
+        Each failure is a dict with id, status, attempts, next_attempt_at and
+        last_error; they are written in one executemany UPDATE by primary key.
+        """
+        if not failures:
+            return
+        
+        async with get_session(session) as session:
+            await session.execute(update(NotificationOutbox), failures)
+    
+    @staticmethod
+    async def purge_sent_notifications(older_than: datetime, session: AsyncSession = None) -> int:
+        """Delete sent outbox messages older than the given time"""
+        async with get_session(session) as session:
+            result = await session.execute(
+                delete(NotificationOutbox)
+                .where(NotificationOutbox.status == "sent", NotificationOutbox.sent_at < older_than)
+            )
+            return result.rowcount
+    
+    @staticmethod
+    async def claim_notification_keys(kind: str, billing_date: date, subject_ids: list[int],
+                                      session: AsyncSession = None) -> set[int]:
+        """Claim (subject, kind, billing date) ledger keys
+        
+        Returns the subject IDs claimed by this call; keys already claimed by
+        an earlier run or another instance are skipped.
+        """
+        if not subject_ids:
+            return set()
+        
+        async with get_session(session) as session:
+            now = datetime.utcnow()
+            result = await session.execute(
+                dialect_insert(NotificationLedger)
+                .values([
+                    {"subject_id": subject_id, "kind": kind, "billing_date": billing_date, "created_at": now}
+                    for subject_id in subject_ids
+                ])
+                .on_conflict_do_nothing(index_elements=["subject_id", "kind", "billing_date"])
+                .returning(NotificationLedger.subject_id)
+            )
+            return set(result.scalars().all())
+    
+    @staticmethod
+    async def purge_notification_ledger(before: date, session: AsyncSession = None) -> int:
+        """Delete ledger keys for billing dates before the given date"""
+        async with get_session(session) as session:
+            result = await session.execute(
+                delete(NotificationLedger).where(NotificationLedger.billing_date < before)
+            )
+            return result.rowcount
+    
+    @staticmethod
+    async def get_job_runs(session: AsyncSession = None) -> dict[str, datetime]:
+        """Get the last successful run of every recorded job"""
+        async with get_session(session) as session:
+            result = await session.execute(
+                select(ScheduledJobRun.job_id, ScheduledJobRun.last_success_at)
+            )
+            return dict(result.all())
+    
+    @staticmethod
+    async def record_job_success(job_id: str, run_at: datetime, session: AsyncSession = None) -> None:
+        """Record a successful run, never moving the mark backwards"""
+        async with get_session(session) as session:
+            statement = dialect_insert(ScheduledJobRun).values(
+                job_id=job_id, last_success_at=run_at, updated_at=datetime.utcnow()
+            )
+            await session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[ScheduledJobRun.job_id],
+                    set_={"last_success_at": run_at, "updated_at": statement.excluded.updated_at},
+                    where=ScheduledJobRun.last_success_at < run_at
+                )
+            )
@@ -0,0 +1,171 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from sqlalchemy import DateTime, bindparam, inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from database.database import engine
+from utils.helpers import due_date_in_month, following_due_date
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+
+async def execute_all(conn: AsyncConnection, statements: list[str]) -> None:
+    """Execute raw DDL statements in order"""
+    for statement in statements:
+        await conn.execute(text(statement))
+
+async def add_column(conn: AsyncConnection, table: str, column: str, ddl: str) -> None:
+    """Add a column unless create_all already created it"""
+    columns = await conn.run_sync(
+        lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns(table)}
+    )
+    if column not in columns:
+        await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+async def _hot_path_indexes(conn: AsyncConnection) -> None:
+    await execute_all(conn, [
+        "CREATE INDEX IF NOT EXISTS ix_tenants_landlord_id ON tenants (landlord_id)",
+        "CREATE INDEX IF NOT EXISTS ix_tenants_rent_due_date_payment_status "
+        "ON tenants (rent_due_date, payment_status)",
+        "CREATE INDEX IF NOT EXISTS ix_properties_owner_id ON properties (owner_id)",
+        "CREATE INDEX IF NOT EXISTS ix_premium_requests_status ON premium_requests (status)",
+        "CREATE INDEX IF NOT EXISTS ix_users_created_at ON users (created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_users_is_premium ON users (is_premium)",
+        "CREATE INDEX IF NOT EXISTS ix_admin_sessions_telegram_id ON admin_sessions (telegram_id)",
+    ])
+
+async def _tenant_next_due_at(conn: AsyncConnection) -> None:
+    await add_column(conn, "tenants", "next_due_at", "TIMESTAMP")
+    
+    # Existing tenants start with this month's due date, one bucket per due day
+    now = datetime.now()
+    for day in range(1, 32):
+        await conn.execute(
+            text("UPDATE tenants SET next_due_at = :due WHERE next_due_at IS NULL AND rent_due_date = :day"),
+            {"due": due_date_in_month(now.year, now.month, day), "day": day}
+        )
+    
+    await execute_all(conn, [
+        "CREATE INDEX IF NOT EXISTS ix_tenants_next_due_at_payment_status "
+        "ON tenants (next_due_at, payment_status)",
+    ])
+
+async def _tenant_status_timestamps(conn: AsyncConnection) -> None:
+    await add_column(conn, "tenants", "status_changed_at", "TIMESTAMP")
+    await add_column(conn, "tenants", "overdue_since", "TIMESTAMP")
+    await execute_all(conn, [
+        "CREATE INDEX IF NOT EXISTS ix_tenants_payment_status_landlord_id "
+        "ON tenants (payment_status, landlord_id)",
+    ])
+
+async def _premium_expiry_index(conn: AsyncConnection) -> None:
+    await execute_all(conn, [
+        "CREATE INDEX IF NOT EXISTS ix_users_is_premium_premium_expires_at "
+        "ON users (is_premium, premium_expires_at)",
+    ])
+
+async def _user_reachability(conn: AsyncConnection) -> None:
+    await add_column(conn, "users", "is_reachable", "BOOLEAN NOT NULL DEFAULT TRUE")
+    await add_column(conn, "users", "unreachable_since", "TIMESTAMP")
+    await execute_all(conn, [
+        "CREATE INDEX IF NOT EXISTS ix_users_is_reachable ON users (is_reachable)",
+    ])
+
+async def _tenant_billing_periods(conn: AsyncConnection) -> None:
+    await add_column(conn, "tenants", "period_due_at", "TIMESTAMP")
+    await add_column(conn, "tenants", "next_period_due_at", "TIMESTAMP")
+    
+    # The open period is the one next_due_at points at; few distinct pairs exist
+    pairs = await conn.execute(text(
+        "SELECT DISTINCT rent_due_date, next_due_at FROM tenants "
+        "WHERE period_due_at IS NULL AND next_due_at IS NOT NULL"
+    ))
+    for day, stored_due in pairs.all():
+        due_at = datetime.fromisoformat(stored_due) if isinstance(stored_due, str) else stored_due
+        
+        # Typed binds store the dates in the same format as ORM writes; the raw
+        # stored value is matched as is
+        await conn.execute(
+            text(
+                "UPDATE tenants SET next_due_at = :due_at, period_due_at = :due_at, "
+                "next_period_due_at = :following "
+                "WHERE period_due_at IS NULL AND rent_due_date = :day AND next_due_at = :stored_due"
+            ).bindparams(
+                bindparam("due_at", type_=DateTime),
+                bindparam("following", type_=DateTime)
+            ),
+            {
+                "due_at": due_at,
+                "following": following_due_date(day or 1, due_at),
+                "day": day,
+                "stored_due": stored_due
+            }
+        )
+    
+    # Paid tenants owe nothing until the next period is due
+    await conn.execute(text(
+        "UPDATE tenants SET next_due_at = next_period_due_at WHERE payment_status = 'paid'"
+    ))
+
+async def _user_updated_at(conn: AsyncConnection) -> None:
+    await add_column(conn, "users", "updated_at", "TIMESTAMP")
+    await execute_all(conn, [
+        "UPDATE users SET updated_at = created_at WHERE updated_at IS NULL",
+        "CREATE INDEX IF NOT EXISTS ix_users_updated_at ON users (updated_at)",
+    ])
+
+# Append new migrations here; never edit or reorder applied ones
+MIGRATIONS: list[Migration] = [
+    Migration(1, "hot_path_indexes", _hot_path_indexes),
+    Migration(2, "tenant_next_due_at", _tenant_next_due_at),
+    Migration(3, "tenant_status_timestamps", _tenant_status_timestamps),
+    Migration(4, "premium_expiry_index", _premium_expiry_index),
+    Migration(5, "user_reachability", _user_reachability),
+    Migration(6, "tenant_billing_periods", _tenant_billing_periods),
+    Migration(7, "user_updated_at", _user_updated_at),
+]
+
+async def run_migrations() -> None:
+    """Apply pending schema migrations"""
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, "
+            "name VARCHAR(100) NOT NULL, "
+            "applied_at TIMESTAMP NOT NULL)"
+        ))
+    
+    for migration in MIGRATIONS:
+        async with engine.begin() as conn:
+            # Serialize concurrent startups of the main and admin bots
+            if engine.dialect.name == "postgresql":
+                await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": 7_201_001})
+            elif engine.dialect.name == "sqlite":
+                # A deferred transaction would let both pass the version check below
+                await conn.exec_driver_sql("BEGIN IMMEDIATE")
+            
+            applied = await conn.execute(
+                text("SELECT 1 FROM schema_migrations WHERE version = :version"),
+                {"version": migration.version}
+            )
+            if applied.first():
+                continue
+            
+            await migration.upgrade(conn)
+            await conn.execute(
+                text(
+                    "INSERT INTO schema_migrations (version, name, applied_at) "
+                    "VALUES (:version, :name, :applied_at) "
+                    "ON CONFLICT (version) DO NOTHING"
+                ),
+                {"version": migration.version, "name": migration.name, "applied_at": datetime.utcnow()}
+            )
+            logger.info(f"Applied migration {migration.version}: {migration.name}")
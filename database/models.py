@@ -1,4 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, Date, DateTime, Boolean, Text, ForeignKey, Float,
+    Index, UniqueConstraint
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
@@ -8,27 +11,34 @@ Base = declarative_base()
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_is_premium_premium_expires_at", "is_premium", "premium_expires_at"),
+    )
     
     id = Column(Integer, primary_key=True)
     telegram_id = Column(Integer, unique=True, nullable=False)
     full_name = Column(String(255))
     phone_number = Column(String(20))
     language = Column(String(2), default="uz")  # uz or ru
-    is_premium = Column(Boolean, default=False)
+    is_premium = Column(Boolean, default=False, index=True)
     premium_expires_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    is_reachable = Column(Boolean, default=True, nullable=False, index=True)  # false once the bot is blocked
+    unreachable_since = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # polled to sync user caches
     
     # Relationships
     properties = relationship("Property", back_populates="owner", cascade="all, delete-orphan")
     tenants = relationship("Tenant", back_populates="landlord", cascade="all, delete-orphan")
     subscriptions = relationship("Subscription", back_populates="user", cascade="all, delete-orphan")
     premium_requests = relationship("PremiumRequest", back_populates="user", cascade="all, delete-orphan")
+    premium_events = relationship("PremiumEvent", back_populates="user", cascade="all, delete-orphan")
 
 class Property(Base):
     __tablename__ = "properties"
     
     id = Column(Integer, primary_key=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     address = Column(Text, nullable=False)
     area_sqm = Column(Float, nullable=False)
     rooms_count = Column(Integer, nullable=False)
@@ -42,17 +52,27 @@ class Property(Base):
 
 class Tenant(Base):
     __tablename__ = "tenants"
+    __table_args__ = (
+        Index("ix_tenants_rent_due_date_payment_status", "rent_due_date", "payment_status"),
+        Index("ix_tenants_next_due_at_payment_status", "next_due_at", "payment_status"),
+        Index("ix_tenants_payment_status_landlord_id", "payment_status", "landlord_id"),
+    )
     
     id = Column(Integer, primary_key=True)
-    landlord_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    landlord_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
     full_name = Column(String(255), nullable=False)
     passport_series = Column(String(10), nullable=False)
     passport_number = Column(String(20), nullable=False)
     move_in_date = Column(DateTime, nullable=False)
     rent_due_date = Column(Integer, default=1)  # Day of month when rent is due
+    next_due_at = Column(DateTime, nullable=True)  # date the outstanding balance is due by
+    period_due_at = Column(DateTime, nullable=True)  # due date of the open billing period
+    next_period_due_at = Column(DateTime, nullable=True)  # due date of the period after it
     last_payment_date = Column(DateTime, nullable=True)
     payment_status = Column(String(20), default="pending")  # pending, paid, partial, overdue
+    status_changed_at = Column(DateTime, nullable=True)
+    overdue_since = Column(DateTime, nullable=True)
     amount_paid = Column(Float, default=0.0)
     amount_due = Column(Float, default=0.0)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -60,6 +80,25 @@ class Tenant(Base):
     # Relationships
     landlord = relationship("User", back_populates="tenants")
     property = relationship("Property", back_populates="tenants")
+    payment_periods = relationship("TenantPaymentPeriod", back_populates="tenant", cascade="all, delete-orphan")
+
+class TenantPaymentPeriod(Base):
+    __tablename__ = "tenant_payment_periods"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "due_at", name="uq_tenant_payment_periods_period"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    due_at = Column(DateTime, nullable=False)  # due date of the closed period
+    payment_status = Column(String(20), nullable=False)
+    amount_due = Column(Float, default=0.0)
+    amount_paid = Column(Float, default=0.0)
+    paid_at = Column(DateTime, nullable=True)
+    closed_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    tenant = relationship("Tenant", back_populates="payment_periods")
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
@@ -84,18 +123,30 @@ class PremiumRequest(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     subscription_type = Column(String(20), nullable=False)  # monthly, yearly
     amount = Column(Float, nullable=False)
-    status = Column(String(20), default="pending")  # pending, approved, rejected
+    status = Column(String(20), default="pending", index=True)  # pending, approved, rejected
     requested_at = Column(DateTime, default=datetime.utcnow)
     processed_at = Column(DateTime, nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="premium_requests")
 
+class PremiumEvent(Base):
+    __tablename__ = "premium_events"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    event = Column(String(20), nullable=False)  # expired
+    premium_expires_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    user = relationship("User", back_populates="premium_events")
+
 class AdminSession(Base):
     __tablename__ = "admin_sessions"
     
     id = Column(Integer, primary_key=True)
-    telegram_id = Column(Integer, nullable=False)
+    telegram_id = Column(Integer, nullable=False, index=True)
     is_authenticated = Column(Boolean, default=False)
     last_activity = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -108,3 +159,46 @@ class AdminConfig(Base):
     value = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class NotificationOutbox(Base):
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("ix_notification_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    chat_id = Column(BigInteger, nullable=False)
+    kind = Column(String(30), nullable=False)  # rent_reminder, rent_overdue, ...
+    text = Column(Text, nullable=False)
+    status = Column(String(20), default="pending")  # pending, sending, sent, dead
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)  # lease expiry while sending
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+class NotificationLedger(Base):
+    __tablename__ = "notification_ledger"
+    __table_args__ = (
+        UniqueConstraint("subject_id", "kind", "billing_date", name="uq_notification_ledger_key"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    subject_id = Column(Integer, nullable=False)  # tenant ID for rent notifications
+    kind = Column(String(30), nullable=False)
+    billing_date = Column(Date, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+    
+    name = Column(String(100), primary_key=True)
+    holder = Column(String(255), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+class ScheduledJobRun(Base):
+    __tablename__ = "scheduled_job_runs"
+    
+    job_id = Column(String(100), primary_key=True)
+    last_success_at = Column(DateTime, nullable=False)  # local scheduled time the run covered
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -75,19 +75,20 @@ async def admin_users_handler(callback: CallbackQuery):
     if callback.from_user.id != config.ADMIN_TELEGRAM_ID:
         return
     
-    if callback.data == "admin_users":
-        page = 0
-    else:
-        # admin_users_page_X
-        page = int(callback.data.split("_")[-1])
+    after_id = before_id = None
+    if callback.data.startswith("admin_users_next_"):
+        after_id = int(callback.data.split("_")[-1])
+    elif callback.data.startswith("admin_users_prev_"):
+        before_id = int(callback.data.split("_")[-1])
     
-    users = await DatabaseService.get_all_users()
+    users, has_previous, has_next = await DatabaseService.get_users_page(after_id, before_id)
+    total_users = await DatabaseService.count_users()
     
-    text = f"👥 Foydalanuvchilar ro'yxati ({len(users)} ta):"
+    text = f"👥 Foydalanuvchilar ro'yxati ({total_users} ta):"
     
     await callback.message.edit_text(
         text,
-        reply_markup=users_list_keyboard(users, page)
+        reply_markup=users_list_keyboard(users, has_previous, has_next)
     )
 
 @router.callback_query(F.data.startswith("admin_user_"))
@@ -99,8 +100,7 @@ async def admin_user_detail_handler(callback: CallbackQuery):
     user_id = int(callback.data.split("_")[2])
     
     # Get user info
-    users = await DatabaseService.get_all_users()
-    user = next((u for u in users if u.id == user_id), None)
+    user = await DatabaseService.get_user_by_id(user_id)
     
     if not user:
         await callback.answer("❌ Foydalanuvchi topilmadi")
@@ -125,8 +125,7 @@ async def admin_activate_premium_handler(callback: CallbackQuery):
     from datetime import datetime, timedelta
     expires_at = datetime.utcnow() + timedelta(days=365)
     
-    await DatabaseService.update_user(
-        telegram_id=None,  # We don't have telegram_id here, need to modify function
+    user = await DatabaseService.update_user(
         user_id=user_id,
         is_premium=True,
         premium_expires_at=expires_at
@@ -135,8 +134,6 @@ async def admin_activate_premium_handler(callback: CallbackQuery):
     await callback.answer("✅ Premium faollashtirildi!")
     
     # Refresh user detail
-    users = await DatabaseService.get_all_users()
-    user = next((u for u in users if u.id == user_id), None)
     user_info = format_admin_user_info(user)
     
     await callback.message.edit_text(
@@ -168,10 +165,9 @@ async def admin_premium_request_detail_handler(callback: CallbackQuery):
     request_id = int(callback.data.split("_")[3])
     
     # Get request info
-    requests = await DatabaseService.get_pending_premium_requests()
-    request = next((r for r in requests if r.id == request_id), None)
+    request = await DatabaseService.get_premium_request_by_id(request_id)
     
-    if not request:
+    if not request or request.status != "pending":
         await callback.answer("❌ So'rov topilmadi")
         return
     
@@ -194,8 +190,7 @@ async def admin_approve_premium_handler(callback: CallbackQuery):
     
     if success:
         # Get request to send notification to user
-        requests = await DatabaseService.get_pending_premium_requests()
-        request = next((r for r in requests if r.id == request_id), None)
+        request = await DatabaseService.get_premium_request_by_id(request_id)
         
         if request:
             try:
@@ -215,13 +210,20 @@ async def admin_stats_handler(callback: CallbackQuery):
         return
     
     stats = await DatabaseService.get_user_stats()
+    premium_rate = (stats['premium_users'] / stats['total_users'] * 100) if stats['total_users'] else 0
     
     stats_text = f"""📊 Statistika:
 
 👥 Jami foydalanuvchilar: {stats['total_users']}
 💎 Premium foydalanuvchilar: {stats['premium_users']}
 📅 Oxirgi 7 kunda qo'shilganlar: {stats['recent_users']}
-💰 Premium foizi: {(stats['premium_users']/stats['total_users']*100):.1f}%"""
+💰 Premium foizi: {premium_rate:.1f}%
+
+🏠 Jami mulklar: {stats['total_properties']}
+👤 Jami ijarachilar: {stats['total_tenants']}
+⚠️ Qarzdor ijarachilar: {stats['overdue_tenants']}
+⏳ Kutilayotgan premium so'rovlar: {stats['pending_premium_requests']}
+💵 Shu oydagi obuna daromadi: {stats['monthly_revenue']:,.0f} so'm"""
     
     await callback.message.edit_text(stats_text)
 
@@ -265,6 +267,5 @@ async def admin_logout_handler(callback: CallbackQuery):
         await session.execute(
             delete(AdminSession).where(AdminSession.telegram_id == callback.from_user.id)
         )
-        await session.commit()
     
     await callback.message.edit_text("👋 Admin paneldan chiqildi.")
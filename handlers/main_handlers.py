@@ -1,3 +1,5 @@
+from typing import Optional
+
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery, Contact
 from aiogram.filters import CommandStart, StateFilter
@@ -5,6 +7,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from database.database import DatabaseService
+from database.models import User
 from keyboards.main_keyboards import (
     language_selection_keyboard, phone_number_keyboard, 
     main_menu_keyboard, profile_keyboard
@@ -20,10 +23,8 @@ class MainStates(StatesGroup):
     waiting_for_name = State()
 
 @router.message(CommandStart())
-async def start_handler(message: Message, state: FSMContext):
+async def start_handler(message: Message, state: FSMContext, user: Optional[User]):
     """Handle /start command"""
-    user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
-    
     if not user:
         # New user - show language selection
         await message.answer(
@@ -32,6 +33,12 @@ async def start_handler(message: Message, state: FSMContext):
         )
         await state.set_state(MainStates.waiting_for_language)
     else:
+        if not user.is_reachable:
+            # The user unblocked the bot; include them in notifications again
+            user = await DatabaseService.update_user(
+                telegram_id=user.telegram_id, is_reachable=True, unreachable_since=None
+            )
+        
         # Existing user - show main menu
         await message.answer(
             get_text(user.language, "main_menu"),
@@ -39,13 +46,10 @@ async def start_handler(message: Message, state: FSMContext):
         )
 
 @router.callback_query(F.data.startswith("lang_"))
-async def language_selection_handler(callback: CallbackQuery, state: FSMContext):
+async def language_selection_handler(callback: CallbackQuery, state: FSMContext, user: Optional[User]):
     """Handle language selection"""
     language = callback.data.split("_")[1]
     
-    # Check if user exists
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
-    
     if not user:
         # Create new user
         user = await DatabaseService.create_user(callback.from_user.id, language)
@@ -70,12 +74,11 @@ async def language_selection_handler(callback: CallbackQuery, state: FSMContext)
         await state.clear()
 
 @router.message(F.contact, StateFilter(MainStates.waiting_for_phone))
-async def phone_number_handler(message: Message, state: FSMContext):
+async def phone_number_handler(message: Message, state: FSMContext, user: User):
     """Handle phone number submission"""
     contact: Contact = message.contact
     
     if contact.user_id != message.from_user.id:
-        user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
         await message.answer(get_text(user.language, "error"))
         return
     
@@ -98,9 +101,8 @@ async def phone_number_handler(message: Message, state: FSMContext):
     "👤 Profil", "👤 Профиль",
     "💎 Obuna", "💎 Подписка"
 ]))
-async def main_menu_handler(message: Message):
+async def main_menu_handler(message: Message, user: Optional[User]):
     """Handle main menu button presses"""
-    user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
     if not user:
         await message.answer("Please start the bot first with /start")
         return
@@ -135,10 +137,8 @@ async def show_profile(message: Message, user):
     )
 
 @router.callback_query(F.data == "edit_profile")
-async def edit_profile_handler(callback: CallbackQuery, state: FSMContext):
+async def edit_profile_handler(callback: CallbackQuery, state: FSMContext, user: User):
     """Handle profile editing"""
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
-    
     await callback.message.edit_text(get_text(user.language, "enter_full_name"))
     await state.set_state(MainStates.waiting_for_name)
 
@@ -163,10 +163,8 @@ async def change_language_handler(callback: CallbackQuery):
     )
 
 @router.callback_query(F.data == "back_to_main")
-async def back_to_main_handler(callback: CallbackQuery):
+async def back_to_main_handler(callback: CallbackQuery, user: User):
     """Handle back to main menu"""
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
-    
     await callback.message.edit_text(
         get_text(user.language, "main_menu"),
         reply_markup=main_menu_keyboard(user.language)
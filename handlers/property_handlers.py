@@ -5,6 +5,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from database.database import DatabaseService
+from database.models import User
 from keyboards.main_keyboards import properties_keyboard, currency_keyboard, cancel_keyboard
 from localization.translations import get_text
 from config import config
@@ -34,14 +35,13 @@ async def show_properties(message: Message, user):
     )
 
 @router.callback_query(F.data == "add_property")
-async def add_property_handler(callback: CallbackQuery, state: FSMContext):
+async def add_property_handler(callback: CallbackQuery, state: FSMContext, user: User):
     """Handle add property request"""
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
-    
     # Check property limit
     properties = await DatabaseService.get_user_properties(user.id)
     
-    if len(properties) >= config.FREE_PROPERTY_LIMIT and not user.is_premium:
+    # The cached user may predate a premium approval made by the admin bot
+    if len(properties) >= config.FREE_PROPERTY_LIMIT and not await DatabaseService.is_premium_active(user.id):
         await callback.message.edit_text(
             get_text(user.language, "property_limit_reached")
         )
@@ -52,14 +52,13 @@ async def add_property_handler(callback: CallbackQuery, state: FSMContext):
     await state.update_data(language=user.language)
 
 @router.message(StateFilter(PropertyStates.waiting_for_address))
-async def address_input_handler(message: Message, state: FSMContext):
+async def address_input_handler(message: Message, state: FSMContext, user: User):
     """Handle address input"""
     data = await state.get_data()
     language = data.get("language", "uz")
     
     if message.text == get_text(language, "cancel"):
         await state.clear()
-        user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
         await show_properties(message, user)
         return
     
@@ -71,14 +70,13 @@ async def address_input_handler(message: Message, state: FSMContext):
     await state.set_state(PropertyStates.waiting_for_area)
 
 @router.message(StateFilter(PropertyStates.waiting_for_area))
-async def area_input_handler(message: Message, state: FSMContext):
+async def area_input_handler(message: Message, state: FSMContext, user: User):
     """Handle area input"""
     data = await state.get_data()
     language = data.get("language", "uz")
     
     if message.text == get_text(language, "cancel"):
         await state.clear()
-        user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
         await show_properties(message, user)
         return
     
@@ -95,14 +93,13 @@ async def area_input_handler(message: Message, state: FSMContext):
     await state.set_state(PropertyStates.waiting_for_rooms)
 
 @router.message(StateFilter(PropertyStates.waiting_for_rooms))
-async def rooms_input_handler(message: Message, state: FSMContext):
+async def rooms_input_handler(message: Message, state: FSMContext, user: User):
     """Handle rooms count input"""
     data = await state.get_data()
     language = data.get("language", "uz")
     
     if message.text == get_text(language, "cancel"):
         await state.clear()
-        user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
         await show_properties(message, user)
         return
     
@@ -122,14 +119,13 @@ async def rooms_input_handler(message: Message, state: FSMContext):
     await state.set_state(PropertyStates.waiting_for_rent)
 
 @router.message(StateFilter(PropertyStates.waiting_for_rent))
-async def rent_input_handler(message: Message, state: FSMContext):
+async def rent_input_handler(message: Message, state: FSMContext, user: User):
     """Handle rent amount input"""
     data = await state.get_data()
     language = data.get("language", "uz")
     
     if message.text == get_text(language, "cancel"):
         await state.clear()
-        user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
         await show_properties(message, user)
         return
     
@@ -146,14 +142,12 @@ async def rent_input_handler(message: Message, state: FSMContext):
     await state.set_state(PropertyStates.waiting_for_currency)
 
 @router.callback_query(F.data.startswith("currency_"), StateFilter(PropertyStates.waiting_for_currency))
-async def currency_selection_handler(callback: CallbackQuery, state: FSMContext):
+async def currency_selection_handler(callback: CallbackQuery, state: FSMContext, user: User):
     """Handle currency selection"""
     currency = callback.data.split("_")[1]
     data = await state.get_data()
     
     # Create property
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
-    
     property_obj = await DatabaseService.create_property(
         owner_id=user.id,
         address=data["address"],
@@ -171,7 +165,6 @@ async def currency_selection_handler(callback: CallbackQuery, state: FSMContext)
     await show_properties(callback.message, user)
 
 @router.callback_query(F.data == "properties")
-async def show_properties_callback(callback: CallbackQuery):
+async def show_properties_callback(callback: CallbackQuery, user: User):
     """Show properties via callback"""
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
     await show_properties(callback.message, user)
@@ -2,6 +2,7 @@ from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 
 from database.database import DatabaseService
+from database.models import User
 from keyboards.main_keyboards import subscription_keyboard, payment_confirmation_keyboard
 from localization.translations import get_text
 from config import config
@@ -18,10 +19,9 @@ async def show_subscription(message: Message, user):
     )
 
 @router.callback_query(F.data.startswith("sub_"))
-async def subscription_type_handler(callback: CallbackQuery):
+async def subscription_type_handler(callback: CallbackQuery, user: User):
     """Handle subscription type selection"""
     sub_type = callback.data.split("_")[1]  # monthly or yearly
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
     
     if sub_type == "monthly":
         amount = config.MONTHLY_SUBSCRIPTION_PRICE
@@ -46,10 +46,9 @@ To'lab bo'lgandan keyin pastdagi "To'lov qildim" tugmasini bosing."""
     )
 
 @router.callback_query(F.data.startswith("payment_confirm_"))
-async def payment_confirmation_handler(callback: CallbackQuery):
+async def payment_confirmation_handler(callback: CallbackQuery, user: User):
     """Handle payment confirmation"""
     sub_type = callback.data.split("_")[2]  # monthly or yearly
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
     
     if sub_type == "monthly":
         amount = config.MONTHLY_SUBSCRIPTION_PRICE
@@ -75,7 +74,6 @@ async def payment_confirmation_handler(callback: CallbackQuery):
     )
 
 @router.callback_query(F.data == "subscription")
-async def show_subscription_callback(callback: CallbackQuery):
+async def show_subscription_callback(callback: CallbackQuery, user: User):
     """Show subscription via callback"""
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
     await show_subscription(callback.message, user)
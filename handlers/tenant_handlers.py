@@ -1,17 +1,28 @@
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from database.database import DatabaseService
-from keyboards.main_keyboards import tenants_keyboard, tenants_with_actions_keyboard, property_selection_keyboard, cancel_keyboard
+from database.models import User
+from keyboards.main_keyboards import (
+    tenants_keyboard, tenants_with_actions_keyboard, tenant_multiselect_keyboard,
+    mark_all_paid_confirmation_keyboard,
+    property_selection_keyboard, cancel_keyboard
+)
 from localization.translations import get_text
-from utils.helpers import format_tenant_list, format_tenant_list_with_properties, parse_date, is_valid_day
+from utils.helpers import (
+    format_tenant_list, format_tenant_list_with_properties,
+    parse_date, is_valid_day
+)
 from datetime import datetime
 
 router = Router()
 
+# Four action buttons per tenant keep a page well below Telegram's keyboard limit
+TENANTS_PER_PAGE = 8
+
 class TenantStates(StatesGroup):
     waiting_for_name = State()
     waiting_for_passport_series = State()
@@ -21,28 +32,60 @@ class TenantStates(StatesGroup):
     waiting_for_due_date = State()
     waiting_for_partial_amount = State()
 
-async def show_tenants(message: Message, user):
-    """Show user tenants with property information"""
-    tenant_property_pairs = await DatabaseService.get_tenants_with_properties(user.id)
-    
-    if not tenant_property_pairs:
-        text = get_text(user.language, "no_tenants")
-        await message.answer(
-            text,
-            reply_markup=tenants_keyboard(user.language)
-        )
-    else:
-        text = format_tenant_list_with_properties(tenant_property_pairs, user.language)
-        await message.answer(
-            text,
-            reply_markup=tenants_with_actions_keyboard(tenant_property_pairs, user.language)
-        )
+async def render_tenants_page(user, page: int = 0) -> tuple:
+    """Build the text and keyboard of one page of user tenants from the database"""
+    total = await DatabaseService.count_user_tenants(user.id)
+    
+    if not total:
+        return get_text(user.language, "no_tenants"), tenants_keyboard(user.language)
+    
+    # Stay on the last page if tenants were removed meanwhile
+    total_pages = (total + TENANTS_PER_PAGE - 1) // TENANTS_PER_PAGE
+    page = max(0, min(page, total_pages - 1))
+    tenant_property_pairs = await DatabaseService.get_tenants_with_properties(
+        user.id, offset=page * TENANTS_PER_PAGE, limit=TENANTS_PER_PAGE
+    )
+    
+    start = page * TENANTS_PER_PAGE + 1
+    text = format_tenant_list_with_properties(tenant_property_pairs, user.language, start=start, total=total)
+    reply_markup = tenants_with_actions_keyboard(
+        tenant_property_pairs, user.language, page, total_pages, start=start
+    )
+    return text, reply_markup
+
+async def show_tenants(message: Message, user, page: int = 0, edit: bool = False):
+    """Show one page of user tenants with property information"""
+    text, reply_markup = await render_tenants_page(user, page)
+    send = message.edit_text if edit else message.answer
+    await send(text, reply_markup=reply_markup)
+
+async def refresh_tenants_page(message: Message, user, number: int = None, message_id: int = None,
+                               current_text: str = None, current_markup: InlineKeyboardMarkup = None):
+    """Re-render the tenants list page holding tenant number and edit it in place
+    
+    The page is rebuilt from the database (a count and one page of at most
+    TENANTS_PER_PAGE rows) rather than patching one tenant's block into the
+    old message text, so a stale keyboard is never sent back. Buttons from
+    before pagination carry no number and refresh the first page.
+    """
+    page = (number - 1) // TENANTS_PER_PAGE if number else 0
+    text, reply_markup = await render_tenants_page(user, page)
+    
+    # Nothing visible changed, so skip the "message is not modified" round trip
+    if (current_text is not None and text.strip() == current_text.strip()
+            and current_markup == reply_markup):
+        return
+    
+    await message.bot.edit_message_text(
+        text,
+        chat_id=message.chat.id,
+        message_id=message_id or message.message_id,
+        reply_markup=reply_markup
+    )
 
 @router.callback_query(F.data == "add_tenant")
-async def add_tenant_handler(callback: CallbackQuery, state: FSMContext):
+async def add_tenant_handler(callback: CallbackQuery, state: FSMContext, user: User):
     """Handle add tenant request"""
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
-    
     # Check if user has properties
     properties = await DatabaseService.get_user_properties(user.id)
     
@@ -55,14 +98,13 @@ async def add_tenant_handler(callback: CallbackQuery, state: FSMContext):
     await state.update_data(language=user.language, user_id=user.id)
 
 @router.message(StateFilter(TenantStates.waiting_for_name))
-async def tenant_name_input_handler(message: Message, state: FSMContext):
+async def tenant_name_input_handler(message: Message, state: FSMContext, user: User):
     """Handle tenant name input"""
     data = await state.get_data()
     language = data.get("language", "uz")
     
     if message.text == get_text(language, "cancel"):
         await state.clear()
-        user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
         await show_tenants(message, user)
         return
     
@@ -74,14 +116,13 @@ async def tenant_name_input_handler(message: Message, state: FSMContext):
     await state.set_state(TenantStates.waiting_for_passport_series)
 
 @router.message(StateFilter(TenantStates.waiting_for_passport_series))
-async def passport_series_input_handler(message: Message, state: FSMContext):
+async def passport_series_input_handler(message: Message, state: FSMContext, user: User):
     """Handle passport series input"""
     data = await state.get_data()
     language = data.get("language", "uz")
     
     if message.text == get_text(language, "cancel"):
         await state.clear()
-        user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
         await show_tenants(message, user)
         return
     
@@ -93,14 +134,13 @@ async def passport_series_input_handler(message: Message, state: FSMContext):
     await state.set_state(TenantStates.waiting_for_passport_number)
 
 @router.message(StateFilter(TenantStates.waiting_for_passport_number))
-async def passport_number_input_handler(message: Message, state: FSMContext):
+async def passport_number_input_handler(message: Message, state: FSMContext, user: User):
     """Handle passport number input"""
     data = await state.get_data()
     language = data.get("language", "uz")
     
     if message.text == get_text(language, "cancel"):
         await state.clear()
-        user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
         await show_tenants(message, user)
         return
     
@@ -112,14 +152,13 @@ async def passport_number_input_handler(message: Message, state: FSMContext):
     await state.set_state(TenantStates.waiting_for_move_in_date)
 
 @router.message(StateFilter(TenantStates.waiting_for_move_in_date))
-async def move_in_date_input_handler(message: Message, state: FSMContext):
+async def move_in_date_input_handler(message: Message, state: FSMContext, user: User):
     """Handle move-in date input"""
     data = await state.get_data()
     language = data.get("language", "uz")
     
     if message.text == get_text(language, "cancel"):
         await state.clear()
-        user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
         await show_tenants(message, user)
         return
     
@@ -154,14 +193,13 @@ async def property_selection_handler(callback: CallbackQuery, state: FSMContext)
     await state.set_state(TenantStates.waiting_for_due_date)
 
 @router.message(StateFilter(TenantStates.waiting_for_due_date))
-async def due_date_input_handler(message: Message, state: FSMContext):
+async def due_date_input_handler(message: Message, state: FSMContext, user: User):
     """Handle rent due date input"""
     data = await state.get_data()
     language = data.get("language", "uz")
     
     if message.text == get_text(language, "cancel"):
         await state.clear()
-        user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
         await show_tenants(message, user)
         return
     
@@ -186,57 +224,83 @@ async def due_date_input_handler(message: Message, state: FSMContext):
     await state.clear()
     
     # Show updated tenants list
-    user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
     await show_tenants(message, user)
 
 @router.callback_query(F.data == "tenants")
-async def show_tenants_callback(callback: CallbackQuery):
+async def show_tenants_callback(callback: CallbackQuery, user: User):
     """Show tenants via callback"""
-    user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
     await show_tenants(callback.message, user)
 
+@router.callback_query(F.data.startswith("tenants_page_"))
+async def tenants_page_handler(callback: CallbackQuery, user: User):
+    """Switch to another page of the tenants list"""
+    page = int(callback.data.split("_")[2])
+    
+    await show_tenants(callback.message, user, page=page, edit=True)
+    await callback.answer()
+
 # Payment status handlers
 @router.callback_query(F.data.startswith("payment_full_"))
-async def payment_full_handler(callback: CallbackQuery):
+async def payment_full_handler(callback: CallbackQuery, user: User):
     """Mark payment as fully paid"""
-    tenant_id = int(callback.data.split("_")[2])
+    parts = callback.data.split("_")
+    tenant_id = int(parts[2])
+    number = int(parts[3]) if len(parts) > 3 else None
     
     success = await DatabaseService.update_tenant_payment_status(tenant_id, "paid")
     
     if success:
         await callback.answer("✅ To'lov to'liq to'langan deb belgilandi")
-        # Refresh the tenants list
-        user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
-        await show_tenants(callback.message, user)
+        # Re-render the list page the tenant is on
+        await refresh_tenants_page(
+            callback.message, user, number,
+            current_text=callback.message.text,
+            current_markup=callback.message.reply_markup
+        )
     else:
         await callback.answer("❌ Xatolik yuz berdi")
 
 @router.callback_query(F.data.startswith("payment_none_"))
-async def payment_none_handler(callback: CallbackQuery):
+async def payment_none_handler(callback: CallbackQuery, user: User):
     """Mark payment as not paid"""
-    tenant_id = int(callback.data.split("_")[2])
+    parts = callback.data.split("_")
+    tenant_id = int(parts[2])
+    number = int(parts[3]) if len(parts) > 3 else None
     
     success = await DatabaseService.update_tenant_payment_status(tenant_id, "overdue")
     
     if success:
         await callback.answer("❌ To'lov to'lanmagan deb belgilandi")
-        # Refresh the tenants list
-        user = await DatabaseService.get_user_by_telegram_id(callback.from_user.id)
-        await show_tenants(callback.message, user)
+        # Re-render the list page the tenant is on
+        await refresh_tenants_page(
+            callback.message, user, number,
+            current_text=callback.message.text,
+            current_markup=callback.message.reply_markup
+        )
     else:
         await callback.answer("❌ Xatolik yuz berdi")
 
 @router.callback_query(F.data.startswith("payment_partial_"))
 async def payment_partial_handler(callback: CallbackQuery, state: FSMContext):
     """Handle partial payment"""
-    tenant_id = int(callback.data.split("_")[2])
+    parts = callback.data.split("_")
+    tenant_id = int(parts[2])
+    number = int(parts[3]) if len(parts) > 3 else None
     
-    await callback.message.edit_text("💰 Qancha to'langan? (son kiriting):")
+    # Ask in a new message so the list can be updated in place afterwards
+    await callback.message.answer("💰 Qancha to'langan? (son kiriting):")
+    await callback.answer()
     await state.set_state(TenantStates.waiting_for_partial_amount)
-    await state.update_data(tenant_id=tenant_id)
+    await state.update_data(
+        tenant_id=tenant_id,
+        tenant_number=number,
+        list_message_id=callback.message.message_id,
+        list_text=callback.message.text,
+        list_markup=callback.message.reply_markup.model_dump() if callback.message.reply_markup else None
+    )
 
 @router.message(StateFilter(TenantStates.waiting_for_partial_amount))
-async def partial_amount_input_handler(message: Message, state: FSMContext):
+async def partial_amount_input_handler(message: Message, state: FSMContext, user: User):
     """Handle partial payment amount input"""
     try:
         amount = float(message.text.replace(",", "").replace(" ", ""))
@@ -247,9 +311,16 @@ async def partial_amount_input_handler(message: Message, state: FSMContext):
         
         if success:
             await message.answer(f"⚡ Qisman to'lov ({amount:,.0f} so'm) qayd qilindi")
-            # Refresh the tenants list
-            user = await DatabaseService.get_user_by_telegram_id(message.from_user.id)
-            await show_tenants(message, user)
+            # Re-render the list page the tenant is on in the original message
+            markup = data.get("list_markup")
+            await refresh_tenants_page(
+                message,
+                user,
+                data.get("tenant_number"),
+                message_id=data.get("list_message_id"),
+                current_text=data.get("list_text"),
+                current_markup=InlineKeyboardMarkup.model_validate(markup) if markup else None
+            )
         else:
             await message.answer("❌ Xatolik yuz berdi")
         
@@ -257,6 +328,107 @@ async def partial_amount_input_handler(message: Message, state: FSMContext):
     except ValueError:
         await message.answer("❌ Noto'g'ri raqam. Qaytadan kiriting:")
 
+# Bulk payment handlers
+@router.callback_query(F.data == "payment_all")
+async def payment_all_handler(callback: CallbackQuery, user: User):
+    """Ask for confirmation before marking every tenant as paid"""
+    total = await DatabaseService.count_user_tenants(user.id)
+    
+    await callback.message.edit_text(
+        get_text(user.language, "confirm_mark_all_paid", count=total),
+        reply_markup=mark_all_paid_confirmation_keyboard(user.language)
+    )
+    await callback.answer()
+
+@router.callback_query(F.data == "payment_all_confirm")
+async def payment_all_confirm_handler(callback: CallbackQuery, user: User):
+    """Mark every tenant of the landlord as fully paid"""
+    marked = await DatabaseService.mark_tenants_paid(user.id)
+    
+    await callback.answer(get_text(user.language, "tenants_marked_paid", count=len(marked)))
+    await show_tenants(callback.message, user, edit=True)
+
+async def show_payment_select(message: Message, state: FSMContext, user, page: int = 0):
+    """Show one page of the multi-select keyboard for marking tenants as paid"""
+    total = await DatabaseService.count_user_tenants(user.id)
+    total_pages = max(1, (total + TENANTS_PER_PAGE - 1) // TENANTS_PER_PAGE)
+    page = max(0, min(page, total_pages - 1))
+    tenant_property_pairs = await DatabaseService.get_tenants_with_properties(
+        user.id, offset=page * TENANTS_PER_PAGE, limit=TENANTS_PER_PAGE
+    )
+    tenants = [(tenant.id, tenant.full_name) for tenant, property_obj in tenant_property_pairs]
+    data = await state.get_data()
+    selected_ids = data.get("payment_selected_ids") or []
+    
+    # Only the visible page is kept; the selection survives page switches
+    await state.update_data(
+        payment_select_tenants=tenants,
+        payment_select_page=page,
+        payment_select_pages=total_pages
+    )
+    await message.edit_text(
+        get_text(user.language, "select_tenants_to_mark"),
+        reply_markup=tenant_multiselect_keyboard(tenants, selected_ids, user.language, page, total_pages)
+    )
+
+@router.callback_query(F.data == "payment_select")
+async def payment_select_handler(callback: CallbackQuery, state: FSMContext, user: User):
+    """Show multi-select keyboard for marking tenants as paid"""
+    await state.update_data(payment_selected_ids=[])
+    await show_payment_select(callback.message, state, user)
+    await callback.answer()
+
+@router.callback_query(F.data.startswith("payment_select_page_"))
+async def payment_select_page_handler(callback: CallbackQuery, state: FSMContext, user: User):
+    """Switch to another page of the multi-select keyboard"""
+    page = int(callback.data.split("_")[3])
+    
+    await show_payment_select(callback.message, state, user, page=page)
+    await callback.answer()
+
+@router.callback_query(F.data.startswith("payment_toggle_"))
+async def payment_toggle_handler(callback: CallbackQuery, state: FSMContext, user: User):
+    """Toggle a tenant in the multi-select keyboard"""
+    tenant_id = int(callback.data.split("_")[2])
+    data = await state.get_data()
+    tenants = data.get("payment_select_tenants") or []
+    selected_ids = data.get("payment_selected_ids") or []
+    
+    if tenant_id in selected_ids:
+        selected_ids.remove(tenant_id)
+    else:
+        selected_ids.append(tenant_id)
+    
+    await state.update_data(payment_selected_ids=selected_ids)
+    await callback.message.edit_reply_markup(
+        reply_markup=tenant_multiselect_keyboard(
+            tenants, selected_ids, user.language,
+            data.get("payment_select_page", 0), data.get("payment_select_pages", 1)
+        )
+    )
+    await callback.answer()
+
+@router.callback_query(F.data == "payment_select_apply")
+async def payment_select_apply_handler(callback: CallbackQuery, state: FSMContext, user: User):
+    """Mark the selected tenants as fully paid"""
+    data = await state.get_data()
+    selected_ids = data.get("payment_selected_ids") or []
+    
+    if not selected_ids:
+        await callback.answer(get_text(user.language, "nothing_selected"))
+        return
+    
+    marked = await DatabaseService.mark_tenants_paid(user.id, selected_ids)
+    await state.update_data(
+        payment_select_tenants=None,
+        payment_select_page=None,
+        payment_select_pages=None,
+        payment_selected_ids=None
+    )
+    
+    await callback.answer(get_text(user.language, "tenants_marked_paid", count=len(marked)))
+    await show_tenants(callback.message, user, edit=True)
+
 @router.callback_query(F.data == "separator")
 async def separator_handler(callback: CallbackQuery):
     """Handle separator button (do nothing)"""
@@ -1,7 +1,9 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from keyboards.markup_cache import cached_markup
 from typing import List
 
+@cached_markup()
 def admin_main_keyboard() -> InlineKeyboardMarkup:
     """Admin main menu keyboard"""
     builder = InlineKeyboardBuilder()
@@ -19,15 +21,11 @@ def admin_main_keyboard() -> InlineKeyboardMarkup:
     builder.adjust(2, 2, 1)
     return builder.as_markup()
 
-def users_list_keyboard(users: List, page: int = 0, per_page: int = 10) -> InlineKeyboardMarkup:
-    """Users list with pagination"""
+def users_list_keyboard(users: List, has_previous: bool = False, has_next: bool = False) -> InlineKeyboardMarkup:
+    """Users list page with keyset pagination"""
     builder = InlineKeyboardBuilder()
     
-    start_idx = page * per_page
-    end_idx = start_idx + per_page
-    page_users = users[start_idx:end_idx]
-    
-    for user in page_users:
+    for user in users:
         premium_status = "💎" if user.is_premium else "👤"
         user_name = user.full_name or f"User_{user.telegram_id}"
         
@@ -40,14 +38,14 @@ def users_list_keyboard(users: List, page: int = 0, per_page: int = 10) -> Inlin
     
     # Pagination buttons
     nav_buttons = []
-    if page > 0:
+    if has_previous and users:
         nav_buttons.append(
-            InlineKeyboardButton(text="⬅️ Oldingi", callback_data=f"admin_users_page_{page-1}")
+            InlineKeyboardButton(text="⬅️ Oldingi", callback_data=f"admin_users_prev_{users[0].id}")
         )
     
-    if end_idx < len(users):
+    if has_next and users:
         nav_buttons.append(
-            InlineKeyboardButton(text="Keyingi ➡️", callback_data=f"admin_users_page_{page+1}")
+            InlineKeyboardButton(text="Keyingi ➡️", callback_data=f"admin_users_next_{users[-1].id}")
         )
     
     if nav_buttons:
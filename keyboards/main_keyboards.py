@@ -1,8 +1,10 @@
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
 from localization.translations import get_text, get_language_flag
+from keyboards.markup_cache import cached_markup
 from typing import List
 
+@cached_markup()
 def language_selection_keyboard() -> InlineKeyboardMarkup:
     """Language selection keyboard"""
     builder = InlineKeyboardBuilder()
@@ -13,6 +15,7 @@ def language_selection_keyboard() -> InlineKeyboardMarkup:
     builder.adjust(1)
     return builder.as_markup()
 
+@cached_markup()
 def phone_number_keyboard(language: str) -> ReplyKeyboardMarkup:
     """Phone number request keyboard"""
     text = get_text(language, "phone_button")
@@ -23,6 +26,7 @@ def phone_number_keyboard(language: str) -> ReplyKeyboardMarkup:
     )
     return keyboard
 
+@cached_markup()
 def main_menu_keyboard(language: str) -> ReplyKeyboardMarkup:
     """Main menu keyboard"""
     builder = ReplyKeyboardBuilder()
@@ -41,6 +45,7 @@ def main_menu_keyboard(language: str) -> ReplyKeyboardMarkup:
     builder.adjust(2, 2, 1)
     return builder.as_markup(resize_keyboard=True)
 
+@cached_markup()
 def properties_keyboard(language: str) -> InlineKeyboardMarkup:
     """Properties management keyboard"""
     builder = InlineKeyboardBuilder()
@@ -59,6 +64,7 @@ def properties_keyboard(language: str) -> InlineKeyboardMarkup:
     builder.adjust(1)
     return builder.as_markup()
 
+@cached_markup()
 def tenants_keyboard(language: str) -> InlineKeyboardMarkup:
     """Tenants management keyboard"""
     builder = InlineKeyboardBuilder()
@@ -77,28 +83,33 @@ def tenants_keyboard(language: str) -> InlineKeyboardMarkup:
     builder.adjust(1)
     return builder.as_markup()
 
-def tenants_with_actions_keyboard(tenant_property_pairs: List, language: str) -> InlineKeyboardMarkup:
-    """Tenants list with payment action buttons"""
+def tenants_with_actions_keyboard(tenant_property_pairs: List, language: str,
+                                  page: int = 0, total_pages: int = 1, start: int = 1) -> InlineKeyboardMarkup:
+    """Tenants list page with payment action buttons
+    
+    Payment callbacks carry the tenant's number in the list so the handler
+    can re-render the page the tenant is on.
+    """
     builder = InlineKeyboardBuilder()
     
-    for tenant, property_obj in tenant_property_pairs:
+    for number, (tenant, property_obj) in enumerate(tenant_property_pairs, start):
         # Payment status buttons for each tenant
         builder.add(
             InlineKeyboardButton(
                 text="✅ To'liq to'langan", 
-                callback_data=f"payment_full_{tenant.id}"
+                callback_data=f"payment_full_{tenant.id}_{number}"
             )
         )
         builder.add(
             InlineKeyboardButton(
                 text="❌ To'lanmagan", 
-                callback_data=f"payment_none_{tenant.id}"
+                callback_data=f"payment_none_{tenant.id}_{number}"
             )
         )
         builder.add(
             InlineKeyboardButton(
                 text="⚡ Qisman to'langan", 
-                callback_data=f"payment_partial_{tenant.id}"
+                callback_data=f"payment_partial_{tenant.id}_{number}"
             )
         )
         builder.add(
@@ -108,7 +119,35 @@ def tenants_with_actions_keyboard(tenant_property_pairs: List, language: str) ->
             )
         )
     
-    # Add tenant and back buttons
+    # Pagination buttons
+    if page > 0:
+        builder.add(
+            InlineKeyboardButton(
+                text=get_text(language, "previous_page"), 
+                callback_data=f"tenants_page_{page - 1}"
+            )
+        )
+    if page < total_pages - 1:
+        builder.add(
+            InlineKeyboardButton(
+                text=get_text(language, "next_page", page=page + 2, total=total_pages), 
+                callback_data=f"tenants_page_{page + 1}"
+            )
+        )
+    
+    # Bulk payment, add tenant and back buttons
+    builder.add(
+        InlineKeyboardButton(
+            text=get_text(language, "mark_all_paid"), 
+            callback_data="payment_all"
+        )
+    )
+    builder.add(
+        InlineKeyboardButton(
+            text=get_text(language, "mark_selected_paid"), 
+            callback_data="payment_select"
+        )
+    )
     builder.add(
         InlineKeyboardButton(
             text=get_text(language, "add_tenant"), 
@@ -124,6 +163,75 @@ def tenants_with_actions_keyboard(tenant_property_pairs: List, language: str) ->
     builder.adjust(1)
     return builder.as_markup()
 
+@cached_markup()
+def mark_all_paid_confirmation_keyboard(language: str) -> InlineKeyboardMarkup:
+    """Confirmation keyboard for marking every tenant as paid"""
+    builder = InlineKeyboardBuilder()
+    builder.add(
+        InlineKeyboardButton(
+            text=get_text(language, "confirm"), 
+            callback_data="payment_all_confirm"
+        )
+    )
+    builder.add(
+        InlineKeyboardButton(
+            text=get_text(language, "cancel"), 
+            callback_data="tenants"
+        )
+    )
+    builder.adjust(1)
+    return builder.as_markup()
+
+def tenant_multiselect_keyboard(tenants: List, selected_ids: List[int], language: str,
+                                page: int = 0, total_pages: int = 1) -> InlineKeyboardMarkup:
+    """Multi-select keyboard page for marking several tenants as paid
+    
+    tenants is the page's list of (tenant_id, full_name) pairs; selected_ids
+    covers every page.
+    """
+    builder = InlineKeyboardBuilder()
+    
+    for tenant_id, full_name in tenants:
+        mark = "☑️" if tenant_id in selected_ids else "⬜"
+        builder.add(
+            InlineKeyboardButton(
+                text=f"{mark} {full_name}", 
+                callback_data=f"payment_toggle_{tenant_id}"
+            )
+        )
+    
+    # Pagination buttons
+    if page > 0:
+        builder.add(
+            InlineKeyboardButton(
+                text=get_text(language, "previous_page"), 
+                callback_data=f"payment_select_page_{page - 1}"
+            )
+        )
+    if page < total_pages - 1:
+        builder.add(
+            InlineKeyboardButton(
+                text=get_text(language, "next_page", page=page + 2, total=total_pages), 
+                callback_data=f"payment_select_page_{page + 1}"
+            )
+        )
+    
+    builder.add(
+        InlineKeyboardButton(
+            text=get_text(language, "apply_selected_paid", count=len(selected_ids)), 
+            callback_data="payment_select_apply"
+        )
+    )
+    builder.add(
+        InlineKeyboardButton(
+            text=get_text(language, "back"), 
+            callback_data="tenants"
+        )
+    )
+    builder.adjust(1)
+    return builder.as_markup()
+
+@cached_markup()
 def currency_keyboard(language: str) -> InlineKeyboardMarkup:
     """Currency selection keyboard"""
     builder = InlineKeyboardBuilder()
@@ -134,6 +242,7 @@ def currency_keyboard(language: str) -> InlineKeyboardMarkup:
     builder.adjust(2)
     return builder.as_markup()
 
+@cached_markup()
 def subscription_keyboard(language: str) -> InlineKeyboardMarkup:
     """Subscription keyboard"""
     builder = InlineKeyboardBuilder()
@@ -158,6 +267,7 @@ def subscription_keyboard(language: str) -> InlineKeyboardMarkup:
     builder.adjust(1)
     return builder.as_markup()
 
+@cached_markup(maxsize=64)
 def payment_confirmation_keyboard(language: str, sub_type: str) -> InlineKeyboardMarkup:
     """Payment confirmation keyboard"""
     builder = InlineKeyboardBuilder()
@@ -176,6 +286,7 @@ def payment_confirmation_keyboard(language: str, sub_type: str) -> InlineKeyboar
     builder.adjust(1)
     return builder.as_markup()
 
+@cached_markup()
 def profile_keyboard(language: str) -> InlineKeyboardMarkup:
     """Profile management keyboard"""
     builder = InlineKeyboardBuilder()
@@ -200,6 +311,7 @@ def profile_keyboard(language: str) -> InlineKeyboardMarkup:
     builder.adjust(1)
     return builder.as_markup()
 
+@cached_markup()
 def reports_keyboard(language: str) -> InlineKeyboardMarkup:
     """Reports keyboard"""
     builder = InlineKeyboardBuilder()
@@ -251,6 +363,7 @@ def property_selection_keyboard(properties: List, language: str) -> InlineKeyboa
     builder.adjust(1)
     return builder.as_markup()
 
+@cached_markup()
 def cancel_keyboard(language: str) -> ReplyKeyboardMarkup:
     """Cancel operation keyboard"""
     builder = ReplyKeyboardBuilder()
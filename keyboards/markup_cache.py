@@ -0,0 +1,20 @@
+from functools import lru_cache, wraps
+
+def cached_markup(maxsize: int = None):
+    """Memoize a keyboard builder, handing every caller its own copy of the markup
+    
+    aiogram markups are mutable pydantic models, so sharing one instance
+    would let a caller change the keyboard every later caller gets. A deep
+    copy of the built markup is still several times cheaper than building it.
+    """
+    def decorator(build):
+        cached = lru_cache(maxsize=maxsize)(build)
+        
+        @wraps(build)
+        def copy_markup(*args):
+            return cached(*args).model_copy(deep=True)
+        
+        copy_markup.cache_info = cached.cache_info
+        copy_markup.cache_clear = cached.cache_clear
+        return copy_markup
+    return decorator
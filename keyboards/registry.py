@@ -0,0 +1,43 @@
+from itertools import product
+
+from localization.translations import TRANSLATIONS
+from keyboards.admin_keyboards import admin_main_keyboard
+from keyboards.main_keyboards import (
+    language_selection_keyboard, phone_number_keyboard, main_menu_keyboard, properties_keyboard,
+    tenants_keyboard, currency_keyboard, subscription_keyboard, payment_confirmation_keyboard,
+    profile_keyboard, reports_keyboard, cancel_keyboard, mark_all_paid_confirmation_keyboard
+)
+
+# Keyboards whose markup depends only on the language. They are memoized
+# per language and every call returns a private copy of the cached markup.
+LANGUAGE_KEYBOARDS = (
+    phone_number_keyboard,
+    main_menu_keyboard,
+    properties_keyboard,
+    tenants_keyboard,
+    currency_keyboard,
+    subscription_keyboard,
+    profile_keyboard,
+    reports_keyboard,
+    cancel_keyboard,
+    mark_all_paid_confirmation_keyboard,
+)
+
+SUBSCRIPTION_TYPES = ("monthly", "yearly")
+
+def warm_up_keyboards() -> int:
+    """Build every static keyboard once per language, returns how many were built"""
+    language_selection_keyboard()
+    admin_main_keyboard()
+    built = 2
+    
+    for language in TRANSLATIONS:
+        for keyboard in LANGUAGE_KEYBOARDS:
+            keyboard(language)
+            built += 1
+    
+    for language, sub_type in product(TRANSLATIONS, SUBSCRIPTION_TYPES):
+        payment_confirmation_keyboard(language, sub_type)
+        built += 1
+    
+    return built
@@ -71,10 +71,24 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "payment_pending": "⏳ To'lanmagan",
         "payment_partial": "⚠️ Qisman to'langan",
         "payment_overdue": "❌ Muddati o'tgan",
+        "mark_all_paid": "✅ Hammasini to'langan deb belgilash",
+        "mark_selected_paid": "☑️ Tanlab belgilash",
+        "select_tenants_to_mark": "☑️ To'langan deb belgilash uchun ijarachilarni tanlang:",
+        "apply_selected_paid": "✅ Tanlanganlarni belgilash ({count})",
+        "tenants_marked_paid": "✅ {count} ta ijarachi to'langan deb belgilandi",
+        "confirm_mark_all_paid": "❓ Barcha {count} ta ijarachini to'langan deb belgilaysizmi?",
+        "nothing_selected": "⚠️ Hech kim tanlanmagan",
+        "previous_page": "⬅️ Oldingi",
+        "next_page": "Keyingi ➡️ ({page}/{total})",
         
         # Notifications
         "rent_reminder": "🔔 To'lov eslatmasi:\n{tenant_name} - {property_address}\nTo'lov muddati: {days} kun qoldi",
         "rent_overdue": "⚠️ To'lov muddati o'tdi:\n{tenant_name} - {property_address}\nQarzlik: {amount} {currency}",
+        "rent_reminder_digest": "🔔 To'lov eslatmasi ({count} ta ijarachi):\nTo'lov muddati: {days} kun qoldi",
+        "rent_reminder_item": "• {tenant_name} - {property_address}",
+        "rent_overdue_digest": "⚠️ To'lov muddati o'tdi ({count} ta ijarachi):",
+        "rent_overdue_item": "• {tenant_name} - {property_address}\n  Qarzlik: {amount} {currency}",
+        "premium_expiry_reminder": "💎 Premium obunangiz {date} kuni tugaydi ({days} kun qoldi).\nObunani uzaytirish uchun: 💎 Obuna",
         
         # Common
         "back": "⬅️ Orqaga",
@@ -155,10 +169,24 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "payment_pending": "⏳ Не оплачено",
         "payment_partial": "⚠️ Частично оплачено",
         "payment_overdue": "❌ Просрочено",
+        "mark_all_paid": "✅ Отметить всех оплатившими",
+        "mark_selected_paid": "☑️ Выбрать и отметить",
+        "select_tenants_to_mark": "☑️ Выберите арендаторов, оплативших аренду:",
+        "apply_selected_paid": "✅ Отметить выбранных ({count})",
+        "tenants_marked_paid": "✅ Отмечено оплатившими: {count}",
+        "confirm_mark_all_paid": "❓ Отметить всех арендаторов ({count}) оплатившими?",
+        "nothing_selected": "⚠️ Никто не выбран",
+        "previous_page": "⬅️ Предыдущая",
+        "next_page": "Следующая ➡️ ({page}/{total})",
         
         # Notifications
         "rent_reminder": "🔔 Напоминание об оплате:\n{tenant_name} - {property_address}\nДо оплаты осталось: {days} дней",
         "rent_overdue": "⚠️ Срок оплаты прошел:\n{tenant_name} - {property_address}\nЗадолженность: {amount} {currency}",
+        "rent_reminder_digest": "🔔 Напоминание об оплате (арендаторов: {count}):\nДо оплаты осталось: {days} дней",
+        "rent_reminder_item": "• {tenant_name} - {property_address}",
+        "rent_overdue_digest": "⚠️ Срок оплаты прошел (арендаторов: {count}):",
+        "rent_overdue_item": "• {tenant_name} - {property_address}\n  Задолженность: {amount} {currency}",
+        "premium_expiry_reminder": "💎 Ваша премиум-подписка истекает {date} (осталось дней: {days}).\nЧтобы продлить: 💎 Подписка",
         
         # Common
         "back": "⬅️ Назад",
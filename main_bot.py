@@ -6,8 +6,13 @@ from aiogram.enums import ParseMode
 
 from config import config
 from database.database import init_database
+from database.migrations import run_migrations
+from keyboards.registry import warm_up_keyboards
 from handlers import main_handlers, property_handlers, tenant_handlers, subscription_handlers, report_handlers
+from middlewares.unit_of_work import CommitBeforeRequestMiddleware, UnitOfWorkMiddleware
+from middlewares.user_context import UserContextMiddleware
 from services.notification_service import init_notification_service
+from services.user_cache_sync import UserCacheSync
 
 # Configure logging
 logging.basicConfig(
@@ -28,17 +33,29 @@ async def main():
     
     # Initialize database
     await init_database()
+    await run_migrations()
     logger.info("Database initialized")
     
+    # Build static keyboards before the first update arrives
+    logger.info(f"Prebuilt {warm_up_keyboards()} keyboards")
+    
     # Create bot instance
     main_bot = Bot(
         token=config.MAIN_BOT_TOKEN,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
     
+    # Never hold a database transaction across a round trip to Telegram
+    main_bot.session.middleware(CommitBeforeRequestMiddleware())
+    
     # Create dispatcher
     dp = Dispatcher()
     
+    # One database session per update, then resolve the sender's user row once
+    for observer in (dp.message, dp.callback_query):
+        observer.outer_middleware(UnitOfWorkMiddleware())
+        observer.outer_middleware(UserContextMiddleware())
+    
     # Register handlers
     dp.include_router(main_handlers.router)
     dp.include_router(property_handlers.router)
@@ -49,6 +66,7 @@ async def main():
     logger.info("Handlers registered")
     
     # Initialize notification service (will be completed when admin bot is ready)
+    notification_service = None
     try:
         from admin_bot import admin_bot
         notification_service = init_notification_service(main_bot, admin_bot)
@@ -57,12 +75,19 @@ async def main():
     except Exception as e:
         logger.warning(f"Could not initialize notification service: {e}")
     
+    # Drop cached users changed by the admin bot or other replicas
+    cache_sync = UserCacheSync(stats_interval=config.USER_CACHE_STATS_INTERVAL)
+    cache_sync.start()
+    
     try:
         logger.info("Starting IjaraNazorat bot...")
         await dp.start_polling(main_bot)
     except Exception as e:
         logger.error(f"Error running bot: {e}")
     finally:
+        await cache_sync.stop()
+        if notification_service:
+            await notification_service.stop_scheduler()
         await main_bot.session.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import TelegramMethod
+from aiogram.types import TelegramObject
+
+from database.database import commit_unit_of_work, unit_of_work
+
+class UnitOfWorkMiddleware(BaseMiddleware):
+    """Run each update in one database session with a single commit
+    
+    The session is injected as `session` and is also picked up implicitly by
+    every DatabaseService call made while handling the update. If the
+    handler raises, everything written since the last Telegram API call is
+    rolled back (see CommitBeforeRequestMiddleware).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        async with unit_of_work() as session:
+            data["session"] = session
+            return await handler(event, data)
+
+class CommitBeforeRequestMiddleware(BaseRequestMiddleware):
+    """Commit the running unit of work before every Telegram API call
+    
+    Without it the transaction, its pooled connection and (on SQLite) the
+    write lock would be held across answer/edit round trips to Telegram.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod
+    ) -> Any:
+        await commit_unit_of_work()
+        return await make_request(bot, method)
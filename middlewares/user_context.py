@@ -0,0 +1,24 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from database.database import DatabaseService
+
+class UserContextMiddleware(BaseMiddleware):
+    """Resolve the sender's User row once per update and inject it as `user`"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        from_user = data.get("event_from_user")
+        
+        # Handlers receive None for users who have not registered yet
+        data["user"] = (
+            await DatabaseService.get_user_by_telegram_id(from_user.id)
+            if from_user else None
+        )
+        return await handler(event, data)
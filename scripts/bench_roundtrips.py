@@ -0,0 +1,247 @@
+"""Count database round trips of the single-statement DatabaseService writes
+
+Runs against a throwaway SQLite file and counts, per call, the SQL
+statements sent (before_cursor_execute), the pool checkouts and the
+commits. Each write is measured twice:
+
+- "before": the read-then-write / add-commit-refresh sequence the method
+  used before it was rewritten, reproduced below as legacy_*
+- "after": the current DatabaseService method (INSERT/UPDATE ... RETURNING
+  or ON CONFLICT upsert)
+
+Both run outside a unit of work with a cold user cache, so only the
+statement shape differs.
+
+Usage: python scripts/bench_roundtrips.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from itertools import count
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_db_dir = tempfile.mkdtemp(prefix="bench_roundtrips_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+from sqlalchemy import event, select, update
+
+from database.database import DatabaseService, async_session_maker, engine, init_database, user_cache
+from database.migrations import run_migrations
+from database.models import AdminConfig, PremiumRequest, Property, Tenant, User
+
+telegram_ids = count(900001)
+
+class RoundTripCounter:
+    """Count statements, pool checkouts and commits on the shared engine"""
+    
+    def __init__(self):
+        self.statements = 0
+        self.checkouts = 0
+        self.commits = 0
+        self.active = False
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine.sync_engine, "commit", self._on_commit)
+        event.listen(engine.sync_engine.pool, "checkout", self._on_checkout)
+    
+    def _on_statement(self, *args):
+        if self.active:
+            self.statements += 1
+    
+    def _on_commit(self, *args):
+        if self.active:
+            self.commits += 1
+    
+    def _on_checkout(self, *args):
+        if self.active:
+            self.checkouts += 1
+    
+    @asynccontextmanager
+    async def measure(self):
+        self.statements = self.checkouts = self.commits = 0
+        self.active = True
+        try:
+            yield self
+        finally:
+            self.active = False
+
+# The sequences below mirror the pre-RETURNING implementations
+
+async def legacy_create_user(telegram_id: int, language: str = "uz") -> User:
+    async with async_session_maker() as session:
+        user = User(telegram_id=telegram_id, language=language)
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+        return user
+
+async def legacy_update_user(telegram_id: int = None, user_id: int = None, **kwargs) -> User:
+    async with async_session_maker() as session:
+        if telegram_id:
+            await session.execute(update(User).where(User.telegram_id == telegram_id).values(**kwargs))
+            await session.commit()
+            result = await session.execute(select(User).where(User.telegram_id == telegram_id))
+        else:
+            await session.execute(update(User).where(User.id == user_id).values(**kwargs))
+            await session.commit()
+            result = await session.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one()
+        await session.commit()
+        return user
+
+async def legacy_create_property(owner_id: int, address: str, area_sqm: float,
+                                 rooms_count: int, monthly_rent: float, currency: str = "UZS") -> Property:
+    async with async_session_maker() as session:
+        property_obj = Property(
+            owner_id=owner_id, address=address, area_sqm=area_sqm,
+            rooms_count=rooms_count, monthly_rent=monthly_rent, currency=currency
+        )
+        session.add(property_obj)
+        await session.commit()
+        await session.refresh(property_obj)
+        return property_obj
+
+async def legacy_create_tenant(landlord_id: int, property_id: int, full_name: str,
+                               passport_series: str, passport_number: str,
+                               move_in_date: datetime, rent_due_date: int) -> Tenant:
+    async with async_session_maker() as session:
+        property_result = await session.execute(select(Property).where(Property.id == property_id))
+        property_obj = property_result.scalar_one()
+        tenant = Tenant(
+            landlord_id=landlord_id, property_id=property_id, full_name=full_name,
+            passport_series=passport_series, passport_number=passport_number,
+            move_in_date=move_in_date, rent_due_date=rent_due_date,
+            amount_due=property_obj.monthly_rent
+        )
+        session.add(tenant)
+        await session.commit()
+        await session.refresh(tenant)
+        return tenant
+
+async def legacy_create_premium_request(user_id: int, subscription_type: str, amount: float) -> PremiumRequest:
+    async with async_session_maker() as session:
+        request = PremiumRequest(user_id=user_id, subscription_type=subscription_type, amount=amount)
+        session.add(request)
+        await session.commit()
+        await session.refresh(request)
+        return request
+
+async def legacy_approve_premium_request(request_id: int) -> bool:
+    async with async_session_maker() as session:
+        request_result = await session.execute(select(PremiumRequest).where(PremiumRequest.id == request_id))
+        request = request_result.scalar_one_or_none()
+        if not request:
+            return False
+        
+        await session.execute(
+            update(PremiumRequest)
+            .where(PremiumRequest.id == request_id)
+            .values(status="approved", processed_at=datetime.utcnow())
+        )
+        expires_at = datetime.utcnow() + timedelta(days=30 if request.subscription_type == "monthly" else 365)
+        await session.execute(
+            update(User).where(User.id == request.user_id).values(is_premium=True, premium_expires_at=expires_at)
+        )
+        await session.commit()
+        return True
+
+async def legacy_set_admin_config(key: str, value: str) -> None:
+    async with async_session_maker() as session:
+        result = await session.execute(select(AdminConfig).where(AdminConfig.key == key))
+        if result.scalar_one_or_none():
+            await session.execute(
+                update(AdminConfig).where(AdminConfig.key == key).values(value=value, updated_at=datetime.utcnow())
+            )
+        else:
+            session.add(AdminConfig(key=key, value=value))
+        await session.commit()
+
+async def seed() -> dict:
+    """Create a landlord with one property for the calls to write against"""
+    user = await DatabaseService.create_user(next(telegram_ids), "uz")
+    property_obj = await DatabaseService.create_property(user.id, "Toshkent, Chilonzor 1", 45.0, 2, 3_000_000.0)
+    await DatabaseService.set_admin_config("card_number", "8600000000000000")
+    return {"user": user, "property": property_obj}
+
+def build_cases(seeded: dict) -> dict:
+    """Map each write to (legacy call, current call), both taking no arguments"""
+    user = seeded["user"]
+    property_obj = seeded["property"]
+    tenant_args = (user.id, property_obj.id, "Tenant", "AA", "1000000", datetime(2026, 1, 1), 5)
+    
+    async def pending_request() -> int:
+        request = await DatabaseService.create_premium_request(user.id, "monthly", 12000)
+        return request.id
+    
+    return {
+        "create_user": (
+            lambda: legacy_create_user(next(telegram_ids)),
+            lambda: DatabaseService.create_user(next(telegram_ids))
+        ),
+        "update_user": (
+            lambda: legacy_update_user(user.telegram_id, language="ru"),
+            lambda: DatabaseService.update_user(user.telegram_id, language="ru")
+        ),
+        "update_user_by_id": (
+            lambda: legacy_update_user(user_id=user.id, full_name="Landlord"),
+            lambda: DatabaseService.update_user(user_id=user.id, full_name="Landlord")
+        ),
+        "create_property": (
+            lambda: legacy_create_property(user.id, "Toshkent", 40.0, 1, 2_000_000.0),
+            lambda: DatabaseService.create_property(user.id, "Toshkent", 40.0, 1, 2_000_000.0)
+        ),
+        "create_tenant": (
+            lambda: legacy_create_tenant(*tenant_args),
+            lambda: DatabaseService.create_tenant(*tenant_args)
+        ),
+        "create_premium_request": (
+            lambda: legacy_create_premium_request(user.id, "monthly", 12000),
+            lambda: DatabaseService.create_premium_request(user.id, "monthly", 12000)
+        ),
+        "approve_premium_request": (
+            (pending_request, legacy_approve_premium_request),
+            (pending_request, DatabaseService.approve_premium_request)
+        ),
+        "set_admin_config_update": (
+            lambda: legacy_set_admin_config("card_number", "8600111111111111"),
+            lambda: DatabaseService.set_admin_config("card_number", "8600222222222222")
+        ),
+        "set_admin_config_insert": (
+            lambda: legacy_set_admin_config(f"legacy_key_{next(telegram_ids)}", "1"),
+            lambda: DatabaseService.set_admin_config(f"key_{next(telegram_ids)}", "1")
+        ),
+    }
+
+async def measure(counter: RoundTripCounter, call) -> dict:
+    """Measure one call; (prepare, call) pairs get prepare's result as their argument"""
+    user_cache.clear()
+    if isinstance(call, tuple):
+        prepare, call = call
+        argument = await prepare()
+        async with counter.measure():
+            await call(argument)
+    else:
+        async with counter.measure():
+            await call()
+    return {"statements": counter.statements, "checkouts": counter.checkouts, "commits": counter.commits}
+
+async def main():
+    await init_database()
+    await run_migrations()
+    seeded = await seed()
+    counter = RoundTripCounter()
+    
+    print(f"{'write':<26}{'mode':<8}{'statements':>12}{'checkouts':>11}{'commits':>9}")
+    for name, (legacy, current) in build_cases(seeded).items():
+        for mode, call in (("before", legacy), ("after", current)):
+            row = await measure(counter, call)
+            print(f"{name:<26}{mode:<8}{row['statements']:>12}{row['checkouts']:>11}{row['commits']:>9}")
+    
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+import os
+import socket
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from config import config
+from database.database import engine, get_session, dialect_insert
+from database.models import SchedulerLease
+
+class LeaderElector:
+    """Elect a single process to run the scheduled jobs
+    
+    On Postgres the leader holds a session-level advisory lock on a
+    dedicated connection opened outside the request pool; the lock is
+    released as soon as that connection dies. Other databases use a row in scheduler_leases that the leader
+    renews and any worker may take over once it has expired.
+    """
+    
+    def __init__(self, name: str = "notification_scheduler", lease_seconds: int = None):
+        self.name = name
+        self.lease_seconds = lease_seconds or config.LEADER_LEASE_SECONDS
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock_key = zlib.crc32(name.encode())
+        self._lock_engine = None
+        self._lock_connection = None
+        self._valid_until = 0.0
+    
+    @property
+    def is_leader(self) -> bool:
+        """True while the last successful refresh is still within the lease"""
+        return time.monotonic() < self._valid_until
+    
+    @property
+    def refresh_interval(self) -> float:
+        """How often refresh() should run to keep the lease"""
+        return self.lease_seconds / 3
+    
+    async def refresh(self) -> bool:
+        """Acquire or renew leadership"""
+        try:
+            if engine.dialect.name == "postgresql":
+                acquired = await self._refresh_advisory_lock()
+            else:
+                acquired = await self._refresh_lease()
+        except Exception as e:
+            print(f"Leader election error: {e}")
+            acquired = False
+        
+        if acquired:
+            self._valid_until = time.monotonic() + self.lease_seconds
+        else:
+            self._valid_until = 0.0
+        return acquired
+    
+    async def _refresh_advisory_lock(self) -> bool:
+        if self._lock_connection is not None:
+            try:
+                await self._lock_connection.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                await self._close_lock_connection()
+        
+        if self._lock_engine is None:
+            # Unpooled, so closing the connection really ends the session holding the lock
+            self._lock_engine = create_async_engine(engine.url, poolclass=NullPool)
+        
+        connection = await self._lock_engine.connect()
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        acquired = await connection.scalar(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": self._lock_key}
+        )
+        if acquired:
+            self._lock_connection = connection
+        else:
+            await connection.close()
+        return bool(acquired)
+    
+    async def _refresh_lease(self) -> bool:
+        now = datetime.utcnow()
+        statement = dialect_insert(SchedulerLease).values(
+            name=self.name,
+            holder=self.holder,
+            expires_at=now + timedelta(seconds=self.lease_seconds)
+        )
+        
+        # Renew our own lease or take over an expired one in a single upsert
+        async with get_session() as session:
+            result = await session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["name"],
+                    set_={"holder": statement.excluded.holder, "expires_at": statement.excluded.expires_at},
+                    where=(SchedulerLease.holder == self.holder) | (SchedulerLease.expires_at < now)
+                )
+                .returning(SchedulerLease.holder)
+            )
+            return result.scalar_one_or_none() == self.holder
+    
+    async def _close_lock_connection(self) -> None:
+        try:
+            await self._lock_connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": self._lock_key}
+            )
+        except Exception:
+            pass  # a dead connection already dropped the lock
+        try:
+            await self._lock_connection.close()
+        except Exception:
+            pass
+        self._lock_connection = None
+    
+    async def release(self) -> None:
+        """Give up leadership so another worker can take over immediately"""
+        self._valid_until = 0.0
+        try:
+            if self._lock_connection is not None:
+                await self._close_lock_connection()
+            if self._lock_engine is not None:
+                await self._lock_engine.dispose()
+                self._lock_engine = None
+            if engine.dialect.name != "postgresql":
+                async with get_session() as session:
+                    await session.execute(
+                        delete(SchedulerLease)
+                        .where(SchedulerLease.name == self.name, SchedulerLease.holder == self.holder)
+                    )
+        except Exception as e:
+            print(f"Failed to release leadership: {e}")
@@ -1,121 +1,452 @@
 import asyncio
+import random
 from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from database.database import DatabaseService
+from services.send_dispatcher import SendDispatcher, is_chat_unreachable
+from services.leader_election import LeaderElector
 from localization.translations import get_text
+from utils.helpers import split_message, due_date_in_month
 from config import config
 
 class NotificationService:
     def __init__(self, main_bot, admin_bot):
         self.main_bot = main_bot
         self.admin_bot = admin_bot
-        self.scheduler = AsyncIOScheduler()
+        self.scheduler = AsyncIOScheduler(job_defaults={
+            'coalesce': True,
+            'misfire_grace_time': config.SCHEDULER_MISFIRE_GRACE
+        })
+        self.dispatcher = SendDispatcher(main_bot)
+        self.elector = LeaderElector()
+        
+        # Daily sweeps: job id -> (hour, sweep, replay every missed day)
+        self.daily_jobs = {
+            'billing_rollover': (0, self.roll_over_billing_periods, False),
+            'overdue_transition': (1, DatabaseService.mark_overdue_tenants, False),
+            'premium_reminders': (11, self.send_premium_expiry_reminders, False),
+            'rent_reminders': (9, self.send_rent_reminders, True),
+            'overdue_notifications': (10, self.send_overdue_notifications, False)
+        }
+    
+    def leader_only(self, job, *args):
+        """Wrap a scheduled job so it only runs on the elected leader"""
+        async def run_if_leader():
+            if self.elector.is_leader:
+                await job(*args)
+        return run_if_leader
+    
+    async def refresh_leadership(self):
+        """Renew leadership and schedule a catch-up of missed sweeps when it is gained"""
+        was_leader = self.elector.is_leader
+        if await self.elector.refresh() and not was_leader:
+            # A separate job, so a long replay never delays the next lease renewal
+            self.scheduler.add_job(
+                self.catch_up_daily_jobs,
+                id='catch_up',
+                replace_existing=True,
+                max_instances=1
+            )
+    
+    async def run_daily_job(self, job_id: str, run_at: datetime = None) -> bool:
+        """Run a daily sweep for the given scheduled time and record its success"""
+        hour, sweep, replay = self.daily_jobs[job_id]
+        run_at = run_at or datetime.now()
+        try:
+            await sweep(run_at)
+            await DatabaseService.record_job_success(job_id, run_at)
+            return True
+        except Exception as e:
+            print(f"Error in {job_id}: {e}")
+            return False
+    
+    @staticmethod
+    def latest_run(hour: int, now: datetime) -> datetime:
+        """Most recent scheduled time of a daily job at or before now"""
+        latest = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+        if latest > now:
+            latest -= timedelta(days=1)
+        return latest
+    
+    @staticmethod
+    def missed_runs(hour: int, last_success: datetime, now: datetime, replay: bool) -> list[datetime]:
+        """Scheduled times of a daily job that passed after its last success"""
+        if last_success is None:
+            return []
+        
+        latest = NotificationService.latest_run(hour, now)
+        runs = [latest - timedelta(days=offset) for offset in range(config.SCHEDULER_CATCH_UP_DAYS)]
+        runs = [run_at for run_at in reversed(runs) if run_at > last_success]
+        if replay:
+            return runs
+        # Only today's run is made up; a day whose regular run is still ahead is left to it
+        return [run_at for run_at in runs[-1:] if run_at.date() == now.date()]
+    
+    async def catch_up_daily_jobs(self):
+        """Replay daily sweeps whose scheduled run was missed while no leader was up"""
+        try:
+            last_runs = await DatabaseService.get_job_runs()
+        except Exception as e:
+            print(f"Error loading job runs: {e}")
+            return
+        
+        now = datetime.now()
+        for job_id, (hour, sweep, replay) in self.daily_jobs.items():
+            if not self.elector.is_leader:
+                # Leadership moved while replaying; the new leader catches up instead
+                return
+            
+            last_success = last_runs.get(job_id)
+            if last_success is None:
+                # First start: nothing was missed yet, so the history starts at the latest slot
+                try:
+                    await DatabaseService.record_job_success(job_id, self.latest_run(hour, now))
+                except Exception as e:
+                    print(f"Error recording {job_id}: {e}")
+                continue
+            
+            for run_at in self.missed_runs(hour, last_success, now, replay):
+                if not self.elector.is_leader:
+                    return
+                print(f"Catching up {job_id} for {run_at:%d.%m.%Y %H:%M}")
+                if not await self.run_daily_job(job_id, run_at):
+                    break
     
     def start_scheduler(self):
         """Start the notification scheduler"""
-        # Check rent reminders daily at 09:00
+        # Every worker competes for leadership; only the leader runs the jobs
         self.scheduler.add_job(
-            self.send_rent_reminders,
-            CronTrigger(hour=9, minute=0),
-            id='rent_reminders'
+            self.refresh_leadership,
+            IntervalTrigger(seconds=self.elector.refresh_interval),
+            id='leader_election',
+            next_run_time=datetime.now(),
+            max_instances=1
         )
         
-        # Check overdue payments daily at 10:00
+        # Billing rollover at 00:00, overdue flags at 01:00, rent reminders at 09:00,
+        # overdue payments at 10:00, premium renewal reminders at 11:00
+        for job_id, (hour, sweep, replay) in self.daily_jobs.items():
+            self.scheduler.add_job(
+                self.leader_only(self.run_daily_job, job_id),
+                CronTrigger(hour=hour, minute=0),
+                id=job_id
+            )
+        
+        # Downgrade expired premium users
         self.scheduler.add_job(
-            self.send_overdue_notifications,
-            CronTrigger(hour=10, minute=0),
-            id='overdue_notifications'
+            self.leader_only(self.expire_premium),
+            IntervalTrigger(seconds=config.PREMIUM_EXPIRY_INTERVAL),
+            id='premium_expiry',
+            max_instances=1
+        )
+        
+        # Deliver queued notifications from the outbox
+        self.scheduler.add_job(
+            self.leader_only(self.deliver_outbox),
+            IntervalTrigger(seconds=config.OUTBOX_POLL_INTERVAL),
+            id='outbox_delivery',
+            max_instances=1,
+            coalesce=True
+        )
+        
+        # Drop old delivered outbox rows daily at 03:00
+        self.scheduler.add_job(
+            self.leader_only(self.purge_outbox),
+            CronTrigger(hour=3, minute=0),
+            id='outbox_purge'
         )
         
         self.scheduler.start()
     
-    async def send_rent_reminders(self):
-        """Send rent payment reminders"""
+    async def stop_scheduler(self):
+        """Stop the scheduler and hand leadership to another worker"""
+        self.scheduler.shutdown(wait=False)
+        await self.elector.release()
+    
+    @staticmethod
+    def build_digest_messages(language: str, kind: str, entries: list[dict], **header_kwargs) -> list[str]:
+        """Build one landlord's messages for a notification kind
+        
+        A single tenant keeps the original one-tenant message; several
+        tenants are listed under one header, split at Telegram's length limit.
+        """
+        if len(entries) == 1:
+            return [get_text(language, kind, **entries[0], **header_kwargs)]
+        
+        header = get_text(language, f"{kind}_digest", count=len(entries), **header_kwargs)
+        items = [get_text(language, f"{kind}_item", **entry) for entry in entries]
+        return split_message(header, items)
+    
+    async def enqueue_digests(self, kind: str, digests: dict, **header_kwargs) -> None:
+        """Queue per-landlord digests built from {telegram_id: (language, entries)}"""
+        messages = []
+        for chat_id, (language, entries) in digests.items():
+            for text in self.build_digest_messages(language, kind, entries, **header_kwargs):
+                messages.append((chat_id, kind, text))
+        
+        await DatabaseService.enqueue_notifications(messages)
+    
+    @staticmethod
+    def retry_delay(attempts: int) -> float:
+        """Exponential backoff with jitter for the given attempt count"""
+        delay = min(config.OUTBOX_MAX_BACKOFF, config.OUTBOX_BASE_BACKOFF * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+    
+    async def deliver_outbox(self):
+        """Deliver due outbox messages until none are left"""
         try:
-            # Get all tenants whose rent is due in X days
-            from database.database import get_session
-            from database.models import Tenant, User, Property
-            from sqlalchemy import select
-            
-            async with get_session() as session:
-                # Calculate target day of month
-                today = datetime.now()
-                target_date = today + timedelta(days=config.RENT_REMINDER_DAYS)
-                target_day = target_date.day
+            while True:
+                claimed = await DatabaseService.claim_notifications(
+                    config.OUTBOX_BATCH_SIZE, config.OUTBOX_LEASE_SECONDS
+                )
+                if not claimed:
+                    return
                 
-                # Get tenants whose rent is due on target day
-                result = await session.execute(
-                    select(Tenant, User, Property)
-                    .join(User, Tenant.landlord_id == User.id)
-                    .join(Property, Tenant.property_id == Property.id)
-                    .where(Tenant.rent_due_date == target_day)
-                    .where(Tenant.payment_status.in_(["pending", "partial"]))
+                errors = await self.dispatcher.send_many(
+                    [(message.chat_id, message.text) for message in claimed]
                 )
                 
-                for tenant, user, property_obj in result:
-                    message_text = get_text(
-                        user.language,
-                        "rent_reminder",
-                        tenant_name=tenant.full_name,
-                        property_address=property_obj.address,
-                        days=config.RENT_REMINDER_DAYS
-                    )
+                now = datetime.utcnow()
+                sent_ids = []
+                failures = []
+                unreachable = set()
+                for message, error in zip(claimed, errors):
+                    if error is None:
+                        sent_ids.append(message.id)
+                        continue
                     
-                    try:
-                        await self.main_bot.send_message(
-                            user.telegram_id,
-                            message_text
-                        )
-                    except Exception as e:
-                        print(f"Failed to send reminder to user {user.telegram_id}: {e}")
+                    attempts = message.attempts + 1
+                    if is_chat_unreachable(error):
+                        # Blocked or deleted chats never recover on retry
+                        unreachable.add(message.chat_id)
+                        dead = True
+                    else:
+                        dead = attempts >= config.OUTBOX_MAX_ATTEMPTS
+                    failures.append({
+                        "id": message.id,
+                        "status": "dead" if dead else "pending",
+                        "attempts": attempts,
+                        "next_attempt_at": now + timedelta(seconds=self.retry_delay(attempts)),
+                        "last_error": str(error)[:1000]
+                    })
+                    if dead and message.chat_id not in unreachable:
+                        print(f"Giving up on {message.kind} to user {message.chat_id}: {error}")
+                
+                await DatabaseService.mark_notifications_sent(sent_ids)
+                await DatabaseService.mark_notifications_failed(failures)
+                await DatabaseService.mark_chats_unreachable(list(unreachable))
         
         except Exception as e:
-            print(f"Error in send_rent_reminders: {e}")
+            print(f"Error in deliver_outbox: {e}")
     
-    async def send_overdue_notifications(self):
-        """Send overdue payment notifications"""
+    async def purge_outbox(self):
+        """Delete delivered outbox messages and ledger keys past the retention period"""
         try:
-            from database.database import get_session
-            from database.models import Tenant, User, Property
-            from sqlalchemy import select
+            older_than = datetime.utcnow() - timedelta(days=config.OUTBOX_RETENTION_DAYS)
+            await DatabaseService.purge_sent_notifications(older_than)
+            
+            # Ledger keys only matter while their billing date can still be swept
+            await DatabaseService.purge_notification_ledger((datetime.now() - timedelta(days=40)).date())
+        except Exception as e:
+            print(f"Error in purge_outbox: {e}")
+    
+    async def iter_landlord_batches(self, *conditions):
+        """Stream sweep rows as {telegram_id: (language, rows)} batches
+        
+        Rows are read in keyset-paged chunks ordered by (landlord, tenant),
+        each in its own short session, so no connection is held while the
+        batch is being processed. A landlord is only yielded once all of their
+        rows have been read.
+        """
+        from database.database import get_session
+        from database.models import Tenant, User, Property
+        from sqlalchemy import select, tuple_
+        
+        query = (
+            select(
+                Tenant.id,
+                Tenant.landlord_id,
+                User.telegram_id,
+                User.language,
+                Tenant.full_name,
+                Property.address,
+                Property.currency,
+                Tenant.amount_due,
+                Tenant.amount_paid
+            )
+            .join(User, Tenant.landlord_id == User.id)
+            .join(Property, Tenant.property_id == Property.id)
+            .where(User.is_reachable == True, *conditions)
+            .order_by(Tenant.landlord_id, Tenant.id)
+            .limit(config.NOTIFICATION_CHUNK_SIZE)
+        )
+        
+        after = None
+        carried = {}
+        while True:
+            chunk_query = query
+            if after is not None:
+                chunk_query = query.where(tuple_(Tenant.landlord_id, Tenant.id) > after)
             
             async with get_session() as session:
-                # Get tenants with overdue payments
-                today = datetime.now()
-                current_day = today.day
-                
-                result = await session.execute(
-                    select(Tenant, User, Property)
-                    .join(User, Tenant.landlord_id == User.id)
-                    .join(Property, Tenant.property_id == Property.id)
-                    .where(Tenant.rent_due_date < current_day)
-                    .where(Tenant.payment_status.in_(["pending", "partial"]))
+                rows = (await session.execute(chunk_query)).all()
+            
+            batch = carried
+            for row in rows:
+                batch.setdefault(row.telegram_id, (row.language, []))[1].append(row)
+            
+            if len(rows) < config.NOTIFICATION_CHUNK_SIZE:
+                if batch:
+                    yield batch
+                return
+            
+            # The last landlord may continue in the next chunk
+            last = rows[-1]
+            after = (last.landlord_id, last.id)
+            carried = {last.telegram_id: batch.pop(last.telegram_id)}
+            if batch:
+                yield batch
+    
+    async def run_sweep(self, kind: str, billing_date, conditions: list, make_entry, **header_kwargs) -> None:
+        """Claim ledger keys and queue digests for every tenant matching the conditions
+        
+        The ledger claim and the outbox insert share one transaction, so a
+        re-run or a second instance only queues tenants nobody claimed yet.
+        """
+        from database.database import unit_of_work
+        
+        async for batch in self.iter_landlord_batches(*conditions):
+            async with unit_of_work():
+                claimed = await DatabaseService.claim_notification_keys(
+                    kind, billing_date, [row.id for language, rows in batch.values() for row in rows]
                 )
                 
-                for tenant, user, property_obj in result:
-                    overdue_amount = tenant.amount_due - tenant.amount_paid
-                    
-                    message_text = get_text(
-                        user.language,
-                        "rent_overdue",
-                        tenant_name=tenant.full_name,
-                        property_address=property_obj.address,
-                        amount=f"{overdue_amount:,.0f}",
-                        currency=property_obj.currency
-                    )
-                    
-                    try:
-                        await self.main_bot.send_message(
-                            user.telegram_id,
-                            message_text
-                        )
-                    except Exception as e:
-                        print(f"Failed to send overdue notification to user {user.telegram_id}: {e}")
+                digests = {}
+                for chat_id, (language, rows) in batch.items():
+                    entries = [make_entry(row) for row in rows if row.id in claimed]
+                    if entries:
+                        digests[chat_id] = (language, entries)
+                
+                await self.enqueue_digests(kind, digests, **header_kwargs)
+    
+    async def roll_over_billing_periods(self, today: datetime = None):
+        """Open the next billing period for tenants whose next due date is near"""
+        from database.database import unit_of_work
+        
+        horizon = (today or datetime.now()) + timedelta(days=config.RENT_REMINDER_DAYS)
+        rolled = 0
+        for day in range(1, 32):
+            # Latest due date for this day that the reminder window has reached
+            due_at = due_date_in_month(horizon.year, horizon.month, day)
+            if due_at.date() > horizon.date():
+                previous = horizon.replace(day=1) - timedelta(days=1)
+                due_at = due_date_in_month(previous.year, previous.month, day)
+            
+            # One transaction per due day, so an interrupted run resumes where it stopped
+            async with unit_of_work() as session:
+                rolled += await DatabaseService.roll_over_billing_bucket(day, due_at, session=session)
+        
+        if rolled:
+            print(f"Opened new billing period for {rolled} tenants")
+    
+    async def send_rent_reminders(self, today: datetime = None):
+        """Queue rent payment reminders, one digest per landlord"""
+        from database.models import Tenant
+        
+        # Calculate target due date
+        today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        target_date = today + timedelta(days=config.RENT_REMINDER_DAYS)
+        
+        # A replayed day may be closer to the due date than usual, or past it
+        days_left = (target_date.date() - datetime.now().date()).days
+        if days_left < 0:
+            return
         
+        # Tenants whose rent is due on target date, once per due date
+        await self.run_sweep(
+            "rent_reminder",
+            target_date.date(),
+            [
+                Tenant.next_due_at >= target_date,
+                Tenant.next_due_at < target_date + timedelta(days=1),
+                Tenant.payment_status.in_(["pending", "partial"])
+            ],
+            lambda row: {"tenant_name": row.full_name, "property_address": row.address},
+            days=days_left
+        )
+    
+    async def send_overdue_notifications(self, today: datetime = None):
+        """Queue overdue payment notifications, one digest per landlord"""
+        from database.models import Tenant
+        
+        # Tenants with overdue payments
+        today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        # Overdue notices repeat daily, so they are keyed by the sweep day
+        await self.run_sweep(
+            "rent_overdue",
+            today.date(),
+            [Tenant.payment_status == "overdue"],
+            lambda row: {
+                "tenant_name": row.full_name,
+                "property_address": row.address,
+                "amount": f"{row.amount_due - row.amount_paid:,.0f}",
+                "currency": row.currency
+            }
+        )
+    
+    async def expire_premium(self):
+        """Downgrade users whose premium subscription has expired"""
+        try:
+            expired = await DatabaseService.expire_premium_users(datetime.utcnow())
+            if expired:
+                print(f"Premium expired for {len(expired)} users")
         except Exception as e:
-            print(f"Error in send_overdue_notifications: {e}")
+            print(f"Error in expire_premium: {e}")
+    
+    async def send_premium_expiry_reminders(self, today: datetime = None):
+        """Queue renewal reminders for premium subscriptions about to expire"""
+        from database.database import unit_of_work
+        
+        now = datetime.utcnow()
+        until = now + timedelta(days=config.PREMIUM_REMINDER_DAYS)
+        after_id = 0
+        while True:
+            rows = await DatabaseService.get_expiring_premium_users(
+                until, after_id, config.NOTIFICATION_CHUNK_SIZE
+            )
+            if not rows:
+                return
+            after_id = rows[-1].id
+            
+            # One reminder per user and expiry date, so a renewal is reminded again
+            by_expiry = {}
+            for row in rows:
+                by_expiry.setdefault(row.premium_expires_at.date(), []).append(row)
+            
+            async with unit_of_work():
+                messages = []
+                for expires_on, expiring in by_expiry.items():
+                    claimed = await DatabaseService.claim_notification_keys(
+                        "premium_expiry", expires_on, [row.id for row in expiring]
+                    )
+                    for row in expiring:
+                        if row.id in claimed:
+                            text = get_text(
+                                row.language,
+                                "premium_expiry_reminder",
+                                date=expires_on.strftime("%d.%m.%Y"),
+                                days=max(0, (expires_on - now.date()).days)
+                            )
+                            messages.append((row.telegram_id, "premium_expiry", text))
+                
+                await DatabaseService.enqueue_notifications(messages)
+            
+            if len(rows) < config.NOTIFICATION_CHUNK_SIZE:
+                return
     
     @staticmethod
     async def notify_admin_payment_request(user, subscription_type, amount):
@@ -164,6 +495,8 @@ Admin paneliga o'ting: /start"""
                 message_text
             )
         except Exception as e:
+            if is_chat_unreachable(e):
+                await DatabaseService.mark_chats_unreachable([user.telegram_id])
             print(f"Failed to send user notification: {e}")
 
 # Global notification service instance
@@ -9,6 +9,7 @@ class PaymentService:
         """Create a new subscription"""
         from database.database import get_session
         from database.models import Subscription
+        from sqlalchemy import insert
         
         # Calculate subscription period
         if subscription_type == "monthly":
@@ -17,18 +18,19 @@ class PaymentService:
             expires_at = datetime.utcnow() + timedelta(days=365)
         
         async with get_session() as session:
-            subscription = Subscription(
-                user_id=user_id,
-                subscription_type=subscription_type,
-                amount=amount,
-                payment_status="paid",
-                starts_at=datetime.utcnow(),
-                expires_at=expires_at
+            result = await session.scalars(
+                insert(Subscription)
+                .values(
+                    user_id=user_id,
+                    subscription_type=subscription_type,
+                    amount=amount,
+                    payment_status="paid",
+                    starts_at=datetime.utcnow(),
+                    expires_at=expires_at
+                )
+                .returning(Subscription)
             )
-            session.add(subscription)
-            await session.commit()
-            await session.refresh(subscription)
-            return subscription
+            return result.one()
     
     @staticmethod
     async def activate_premium(user_id: int, subscription_type: str) -> bool:
@@ -41,7 +43,7 @@ class PaymentService:
                 expires_at = datetime.utcnow() + timedelta(days=365)
             
             # Update user premium status
-            from database.database import get_session
+            from database.database import get_session, user_cache
             from database.models import User
             from sqlalchemy import update
             
@@ -51,7 +53,7 @@ class PaymentService:
                     .where(User.id == user_id)
                     .values(is_premium=True, premium_expires_at=expires_at)
                 )
-                await session.commit()
+            user_cache.invalidate_user_id(user_id)
             
             return True
         except Exception as e:
@@ -4,80 +4,96 @@ from database.database import DatabaseService
 from localization.translations import get_text
 
 class ReportService:
+    @staticmethod
+    async def get_payments_since(session, user_id: int, since: datetime) -> list:
+        """Get a landlord's payments since a date from open and archived billing periods"""
+        from database.models import Tenant, TenantPaymentPeriod
+        from sqlalchemy import select, union_all
+        
+        # Rolled-over periods only live on in tenant_payment_periods
+        open_periods = (
+            select(
+                Tenant.id.label("tenant_id"),
+                Tenant.property_id,
+                Tenant.payment_status,
+                Tenant.amount_paid,
+                Tenant.last_payment_date.label("paid_at")
+            )
+            .where(Tenant.landlord_id == user_id, Tenant.last_payment_date >= since)
+        )
+        archived_periods = (
+            select(
+                TenantPaymentPeriod.tenant_id,
+                Tenant.property_id,
+                TenantPaymentPeriod.payment_status,
+                TenantPaymentPeriod.amount_paid,
+                TenantPaymentPeriod.paid_at
+            )
+            .join(Tenant, TenantPaymentPeriod.tenant_id == Tenant.id)
+            .where(Tenant.landlord_id == user_id, TenantPaymentPeriod.paid_at >= since)
+        )
+        result = await session.execute(union_all(open_periods, archived_periods))
+        return result.all()
+    
     @staticmethod
     async def generate_monthly_report(user_id: int) -> Dict[str, Any]:
         """Generate monthly income report"""
         from database.database import get_session
-        from database.models import Tenant, Property
-        from sqlalchemy import select, func
         
         async with get_session() as session:
             # Current month start
             now = datetime.now()
             month_start = datetime(now.year, now.month, 1)
             
-            # Get user's tenants and their payments
-            result = await session.execute(
-                select(Tenant, Property)
-                .join(Property, Tenant.property_id == Property.id)
-                .where(Tenant.landlord_id == user_id)
-                .where(Tenant.last_payment_date >= month_start)
-            )
-            
-            tenants_with_properties = result.all()
+            # Get user's payments this month, including rolled-over periods
+            payments = await ReportService.get_payments_since(session, user_id, month_start)
             
             total_income = 0
-            paid_tenants = 0
-            properties_count = len(set(tp.property_id for t, p in tenants_with_properties for tp in [t]))
+            tenant_ids = set()
+            paid_tenant_ids = set()
+            properties_count = len(set(payment.property_id for payment in payments))
             
-            for tenant, property_obj in tenants_with_properties:
-                if tenant.payment_status == "paid":
-                    total_income += tenant.amount_paid
-                    paid_tenants += 1
-                elif tenant.payment_status == "partial":
-                    total_income += tenant.amount_paid
+            for payment in payments:
+                tenant_ids.add(payment.tenant_id)
+                if payment.payment_status == "paid":
+                    total_income += payment.amount_paid
+                    paid_tenant_ids.add(payment.tenant_id)
+                elif payment.payment_status == "partial":
+                    total_income += payment.amount_paid
             
+            paid_tenants = len(paid_tenant_ids)
             return {
                 "month": now.strftime("%B %Y"),
                 "total_income": total_income,
                 "paid_tenants": paid_tenants,
-                "total_tenants": len(tenants_with_properties),
+                "total_tenants": len(tenant_ids),
                 "properties_count": properties_count,
-                "payment_rate": (paid_tenants / len(tenants_with_properties) * 100) if tenants_with_properties else 0
+                "payment_rate": (paid_tenants / len(tenant_ids) * 100) if tenant_ids else 0
             }
     
     @staticmethod
     async def generate_yearly_report(user_id: int) -> Dict[str, Any]:
         """Generate yearly income report"""
         from database.database import get_session
-        from database.models import Tenant, Property
-        from sqlalchemy import select
         
         async with get_session() as session:
             # Current year start
             now = datetime.now()
             year_start = datetime(now.year, 1, 1)
             
-            # Get user's tenants and their payments for the year
-            result = await session.execute(
-                select(Tenant, Property)
-                .join(Property, Tenant.property_id == Property.id)
-                .where(Tenant.landlord_id == user_id)
-                .where(Tenant.last_payment_date >= year_start)
-            )
-            
-            tenants_with_properties = result.all()
+            # Get user's payments for the year, including rolled-over periods
+            payments = await ReportService.get_payments_since(session, user_id, year_start)
             
             monthly_income = {}
             total_income = 0
             
-            for tenant, property_obj in tenants_with_properties:
-                if tenant.last_payment_date and tenant.payment_status in ["paid", "partial"]:
-                    month_key = tenant.last_payment_date.strftime("%Y-%m")
+            for payment in payments:
+                if payment.paid_at and payment.payment_status in ["paid", "partial"]:
+                    month_key = payment.paid_at.strftime("%Y-%m")
                     if month_key not in monthly_income:
                         monthly_income[month_key] = 0
-                    monthly_income[month_key] += tenant.amount_paid
-                    total_income += tenant.amount_paid
+                    monthly_income[month_key] += payment.amount_paid
+                    total_income += payment.amount_paid
             
             return {
                 "year": now.year,
@@ -96,21 +112,19 @@ class ReportService:
         
         async with get_session() as session:
             # Get tenants with overdue payments
-            today = datetime.now()
-            current_day = today.day
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
             
             result = await session.execute(
                 select(Tenant, Property)
                 .join(Property, Tenant.property_id == Property.id)
                 .where(Tenant.landlord_id == user_id)
-                .where(Tenant.rent_due_date < current_day)
-                .where(Tenant.payment_status.in_(["pending", "partial"]))
+                .where(Tenant.payment_status == "overdue")
             )
             
             overdue_list = []
             for tenant, property_obj in result:
                 overdue_amount = tenant.amount_due - tenant.amount_paid
-                days_overdue = current_day - tenant.rent_due_date
+                days_overdue = max(0, (today - tenant.next_due_at).days) if tenant.next_due_at else 0
                 
                 overdue_list.append({
                     "tenant_name": tenant.full_name,
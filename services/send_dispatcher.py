@@ -0,0 +1,118 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+
+from config import config
+
+def is_chat_unreachable(error: Exception) -> bool:
+    """True if the error means the chat will never accept messages again"""
+    if isinstance(error, TelegramForbiddenError):
+        return True  # bot blocked, user deactivated, kicked from chat
+    return isinstance(error, TelegramBadRequest) and "chat not found" in str(error).lower()
+
+class TokenBucket:
+    """Token bucket rate limiter that backs off adaptively on flood control"""
+    
+    def __init__(self, rate: float, capacity: float = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def on_success(self) -> None:
+        """Additively recover the rate after a successful send"""
+        self.rate = min(self.max_rate, self.rate + 0.1)
+    
+    def on_retry_after(self, seconds: float) -> None:
+        """Pause all senders and halve the rate after a RetryAfter response"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+        self.rate = max(1.0, self.rate / 2)
+
+class SendDispatcher:
+    """Concurrent Telegram sender respecting global and per-chat limits
+    
+    Messages share one global token bucket (Telegram allows about 30 msg/s
+    per bot). Messages to the same chat are sent in order, spaced by the
+    per-chat interval.
+    """
+    
+    def __init__(self, bot, rate: float = None, per_chat_interval: float = None,
+                 max_concurrency: int = None, max_retries: int = 3):
+        self.bot = bot
+        self.bucket = TokenBucket(rate or config.TELEGRAM_GLOBAL_RATE)
+        self.per_chat_interval = per_chat_interval or config.TELEGRAM_PER_CHAT_INTERVAL
+        self.max_concurrency = max_concurrency or config.TELEGRAM_MAX_CONCURRENCY
+        self.max_retries = max_retries
+    
+    async def send(self, chat_id: int, text: str, **kwargs):
+        """Send one message, waiting out RetryAfter responses"""
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            try:
+                result = await self.bot.send_message(chat_id, text, **kwargs)
+            except TelegramRetryAfter as e:
+                self.bucket.on_retry_after(e.retry_after)
+                if attempt == self.max_retries:
+                    raise
+                continue
+            
+            self.bucket.on_success()
+            return result
+    
+    async def send_many(self, messages: Iterable[tuple[int, str]]) -> list[Optional[Exception]]:
+        """Send (chat_id, text) pairs concurrently
+        
+        Returns one entry per message in input order: None on success or the
+        exception that made the send fail.
+        """
+        messages = list(messages)
+        results: list[Optional[Exception]] = [None] * len(messages)
+        
+        by_chat: dict[int, list[int]] = defaultdict(list)
+        for index, (chat_id, _) in enumerate(messages):
+            by_chat[chat_id].append(index)
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def send_chat(indexes: list[int]) -> None:
+            async with semaphore:
+                for position, index in enumerate(indexes):
+                    if position:
+                        await asyncio.sleep(self.per_chat_interval)
+                    chat_id, text = messages[index]
+                    try:
+                        await self.send(chat_id, text)
+                    except Exception as e:
+                        results[index] = e
+                        if is_chat_unreachable(e):
+                            # The rest of this chat's messages would fail the same way
+                            for skipped in indexes[position + 1:]:
+                                results[skipped] = e
+                            return
+        
+        await asyncio.gather(*(send_chat(indexes) for indexes in by_chat.values()))
+        return results
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from config import config
+from database.database import DatabaseService, user_cache
+
+class UserCacheSync:
+    """Keep this process's user_cache in step with writes made elsewhere
+    
+    Every bot process (and every main bot replica) has its own cache, so a
+    premium approval in the admin bot or a language change on another
+    replica is only seen here once the entry is dropped. Polling
+    users.updated_at bounds that delay to about one interval.
+    """
+    
+    def __init__(self, interval: int = None, stats_interval: int = None):
+        self.interval = interval or config.USER_CACHE_SYNC_INTERVAL
+        self.stats_interval = stats_interval
+        self._checked_at = datetime.utcnow()
+        self._stats_logged_at = time.monotonic()
+        self._task = None
+    
+    async def sync_once(self) -> int:
+        """Drop cached users changed since the previous poll"""
+        # Overlap the windows so rows committed just after a poll are not missed
+        since = self._checked_at - timedelta(seconds=self.interval)
+        checked_at = datetime.utcnow()
+        
+        telegram_ids = await DatabaseService.get_users_changed_since(since)
+        for telegram_id in telegram_ids:
+            user_cache.invalidate(telegram_id)
+        
+        self._checked_at = checked_at
+        return len(telegram_ids)
+    
+    async def run(self) -> None:
+        """Poll until cancelled"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sync_once()
+            except Exception as e:
+                print(f"Error syncing user cache: {e}")
+            
+            if self.stats_interval and time.monotonic() - self._stats_logged_at >= self.stats_interval:
+                self._stats_logged_at = time.monotonic()
+                print(f"User cache stats: {DatabaseService.get_user_cache_stats()}")
+    
+    def start(self) -> None:
+        """Start polling in the background"""
+        self._task = asyncio.create_task(self.run())
+    
+    async def stop(self) -> None:
+        """Stop polling"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,44 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The engine is created on import, so point it at a throwaway database first
+_db_dir = tempfile.mkdtemp(prefix="rental_bot_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+from database.database import engine, init_database, user_cache, user_count_cache
+from database.models import Base
+
+def run_async(coro):
+    """Run a coroutine on a fresh event loop and release its pooled connections"""
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+    return asyncio.run(runner())
+
+@pytest.fixture
+def run():
+    return run_async
+
+@pytest.fixture
+def db():
+    """Start every database test from empty tables and a cold user cache"""
+    async def reset():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await init_database()
+    
+    run_async(reset())
+    user_cache.clear()
+    user_count_cache.clear()
+    yield
+    user_cache.clear()
+    user_count_cache.clear()
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from database.database import DatabaseService, get_session
+from database.models import Tenant, TenantPaymentPeriod
+
+async def create_landlord_with_tenant(rent_due_date: int = 5, monthly_rent: float = 1_000_000.0) -> Tenant:
+    user = await DatabaseService.create_user(700001, "uz")
+    property_obj = await DatabaseService.create_property(user.id, "Toshkent", 40.0, 2, monthly_rent)
+    return await DatabaseService.create_tenant(
+        user.id, property_obj.id, "Ali Valiyev", "AA", "1234567", datetime(2026, 1, 1), rent_due_date
+    )
+
+async def load_tenant(tenant_id: int) -> Tenant:
+    async with get_session() as session:
+        return await session.scalar(select(Tenant).where(Tenant.id == tenant_id))
+
+async def set_open_period(tenant_id: int, period_due_at: datetime, next_period_due_at: datetime) -> None:
+    """Pin a tenant's open billing period to fixed dates"""
+    async with get_session() as session:
+        await session.execute(
+            update(Tenant)
+            .where(Tenant.id == tenant_id)
+            .values(
+                next_due_at=period_due_at,
+                period_due_at=period_due_at,
+                next_period_due_at=next_period_due_at
+            )
+        )
+
+async def load_periods(tenant_id: int) -> list[TenantPaymentPeriod]:
+    async with get_session() as session:
+        result = await session.scalars(
+            select(TenantPaymentPeriod)
+            .where(TenantPaymentPeriod.tenant_id == tenant_id)
+            .order_by(TenantPaymentPeriod.due_at)
+        )
+        return list(result.all())
@@ -0,0 +1,114 @@
+from datetime import datetime
+
+from database.database import DatabaseService
+from factories import create_landlord_with_tenant, load_periods, load_tenant, set_open_period
+from services.notification_service import NotificationService
+
+RENT = 1_000_000.0
+
+async def tenant_due_on_31st():
+    tenant = await create_landlord_with_tenant(rent_due_date=31, monthly_rent=RENT)
+    await set_open_period(tenant.id, datetime(2026, 1, 31), datetime(2026, 2, 28))
+    return tenant
+
+def test_paid_period_is_archived_and_the_next_one_opened(db, run):
+    async def scenario():
+        tenant = await tenant_due_on_31st()
+        await DatabaseService.update_tenant_payment_status(tenant.id, "paid")
+        rolled = await DatabaseService.roll_over_billing_bucket(31, datetime(2026, 2, 28))
+        return rolled, await load_tenant(tenant.id), await load_periods(tenant.id)
+    
+    rolled, tenant, periods = run(scenario())
+    
+    assert rolled == 1
+    assert [(p.due_at, p.payment_status, p.amount_paid) for p in periods] == [(datetime(2026, 1, 31), "paid", RENT)]
+    assert tenant.payment_status == "pending"
+    assert tenant.amount_due == RENT
+    assert tenant.amount_paid == 0.0
+    assert tenant.next_due_at == datetime(2026, 2, 28)
+    assert tenant.period_due_at == datetime(2026, 2, 28)
+    assert tenant.next_period_due_at == datetime(2026, 3, 31)
+    assert tenant.overdue_since is None
+
+def test_unpaid_balance_is_carried_forward_and_stays_overdue(db, run):
+    async def scenario():
+        tenant = await tenant_due_on_31st()
+        await DatabaseService.mark_overdue_tenants(datetime(2026, 2, 2))
+        flagged = await load_tenant(tenant.id)
+        await DatabaseService.roll_over_billing_bucket(31, datetime(2026, 2, 28))
+        rolled = await load_tenant(tenant.id)
+        await DatabaseService.mark_overdue_tenants(datetime(2026, 2, 3))
+        return flagged, rolled, await load_tenant(tenant.id), await load_periods(tenant.id)
+    
+    flagged, rolled, reflagged, periods = run(scenario())
+    
+    assert flagged.payment_status == "overdue"
+    assert [(p.payment_status, p.amount_paid) for p in periods] == [("overdue", 0.0)]
+    assert rolled.payment_status == "pending"
+    assert rolled.amount_due == 2 * RENT
+    assert rolled.next_due_at == datetime(2026, 1, 31)
+    assert rolled.overdue_since == flagged.overdue_since
+    assert reflagged.payment_status == "overdue"
+    assert reflagged.overdue_since == flagged.overdue_since
+
+def test_partial_payment_carries_only_the_remainder(db, run):
+    async def scenario():
+        tenant = await tenant_due_on_31st()
+        await DatabaseService.update_tenant_payment_status(tenant.id, "partial", 300_000.0)
+        await DatabaseService.roll_over_billing_bucket(31, datetime(2026, 2, 28))
+        return await load_tenant(tenant.id)
+    
+    tenant = run(scenario())
+    
+    assert tenant.amount_due == RENT + 700_000.0
+    assert tenant.amount_paid == 0.0
+    assert tenant.next_due_at == datetime(2026, 1, 31)
+
+def test_paying_off_arrears_moves_the_due_date_to_the_next_period(db, run):
+    async def scenario():
+        tenant = await tenant_due_on_31st()
+        await DatabaseService.roll_over_billing_bucket(31, datetime(2026, 2, 28))
+        await DatabaseService.update_tenant_payment_status(tenant.id, "paid")
+        return await load_tenant(tenant.id)
+    
+    tenant = run(scenario())
+    
+    assert tenant.payment_status == "paid"
+    assert tenant.amount_paid == 2 * RENT
+    assert tenant.next_due_at == datetime(2026, 3, 31)
+
+def test_rolling_a_bucket_twice_is_a_no_op(db, run):
+    async def scenario():
+        tenant = await tenant_due_on_31st()
+        first = await DatabaseService.roll_over_billing_bucket(31, datetime(2026, 2, 28))
+        second = await DatabaseService.roll_over_billing_bucket(31, datetime(2026, 2, 28))
+        return first, second, await load_tenant(tenant.id), await load_periods(tenant.id)
+    
+    first, second, tenant, periods = run(scenario())
+    
+    assert (first, second) == (1, 0)
+    assert len(periods) == 1
+    assert tenant.amount_due == 2 * RENT
+
+def test_scheduled_rollover_clamps_the_31st_to_the_end_of_february(db, run):
+    async def scenario():
+        tenant = await tenant_due_on_31st()
+        await DatabaseService.update_tenant_payment_status(tenant.id, "paid")
+        await NotificationService(None, None).roll_over_billing_periods(datetime(2026, 2, 26))
+        return await load_tenant(tenant.id)
+    
+    tenant = run(scenario())
+    
+    assert tenant.period_due_at == datetime(2026, 2, 28)
+    assert tenant.next_period_due_at == datetime(2026, 3, 31)
+    assert tenant.payment_status == "pending"
+
+def test_scheduled_rollover_waits_for_the_reminder_window(db, run):
+    async def scenario():
+        tenant = await tenant_due_on_31st()
+        await NotificationService(None, None).roll_over_billing_periods(datetime(2026, 2, 24))
+        return await load_tenant(tenant.id)
+    
+    tenant = run(scenario())
+    
+    assert tenant.period_due_at == datetime(2026, 1, 31)
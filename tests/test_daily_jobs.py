@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from database.database import DatabaseService
+from services.notification_service import NotificationService
+
+class StubElector:
+    is_leader = True
+
+def make_service() -> NotificationService:
+    service = NotificationService(None, None)
+    service.elector = StubElector()
+    return service
+
+def test_non_replayed_job_skips_a_day_whose_run_is_still_ahead():
+    now = datetime(2026, 10, 17, 8, 0)
+    last_success = datetime(2026, 10, 15, 10, 0)
+    
+    assert NotificationService.missed_runs(10, last_success, now, replay=False) == []
+
+def test_non_replayed_job_makes_up_todays_missed_run():
+    now = datetime(2026, 10, 17, 10, 30)
+    last_success = datetime(2026, 10, 15, 10, 0)
+    
+    assert NotificationService.missed_runs(10, last_success, now, replay=False) == [datetime(2026, 10, 17, 10, 0)]
+
+def test_replayed_job_makes_up_every_missed_day_in_order():
+    now = datetime(2026, 10, 17, 8, 0)
+    last_success = datetime(2026, 10, 14, 9, 0)
+    
+    assert NotificationService.missed_runs(9, last_success, now, replay=True) == [
+        datetime(2026, 10, 15, 9, 0),
+        datetime(2026, 10, 16, 9, 0)
+    ]
+
+def test_replayed_job_goes_back_at_most_the_catch_up_window():
+    now = datetime(2026, 10, 17, 9, 30)
+    last_success = datetime(2026, 9, 1, 9, 0)
+    
+    runs = NotificationService.missed_runs(9, last_success, now, replay=True)
+    
+    assert runs == [datetime(2026, 10, 15, 9, 0), datetime(2026, 10, 16, 9, 0), datetime(2026, 10, 17, 9, 0)]
+
+def test_no_history_replays_nothing():
+    assert NotificationService.missed_runs(10, None, datetime(2026, 10, 17, 12, 0), replay=True) == []
+
+def test_first_start_records_the_latest_slots_without_running(db, run):
+    service = make_service()
+    ran = []
+    
+    async def run_daily_job(job_id, run_at=None):
+        ran.append(job_id)
+        return True
+    
+    service.run_daily_job = run_daily_job
+    
+    async def scenario():
+        await service.catch_up_daily_jobs()
+        return await DatabaseService.get_job_runs()
+    
+    job_runs = run(scenario())
+    
+    assert ran == []
+    assert set(job_runs) == set(service.daily_jobs)
+    for job_id, (hour, sweep, replay) in service.daily_jobs.items():
+        assert job_runs[job_id].hour == hour
+        assert job_runs[job_id] <= datetime.now()
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from utils.helpers import due_date_in_month, first_due_date, following_due_date, split_message
+
+def test_due_date_is_clamped_to_the_end_of_short_months():
+    assert due_date_in_month(2026, 2, 31) == datetime(2026, 2, 28)
+    assert due_date_in_month(2028, 2, 30) == datetime(2028, 2, 29)
+    assert due_date_in_month(2026, 4, 31) == datetime(2026, 4, 30)
+    assert due_date_in_month(2026, 1, 31) == datetime(2026, 1, 31)
+
+def test_first_due_date_on_or_after_a_date():
+    assert first_due_date(5, datetime(2026, 3, 5, 14, 30)) == datetime(2026, 3, 5)
+    assert first_due_date(5, datetime(2026, 3, 6)) == datetime(2026, 4, 5)
+    assert first_due_date(10, datetime(2026, 12, 20)) == datetime(2027, 1, 10)
+    assert first_due_date(31, datetime(2026, 2, 1)) == datetime(2026, 2, 28)
+
+def test_following_due_date_keeps_the_due_day_after_a_short_month():
+    due_at = datetime(2026, 1, 31)
+    schedule = []
+    for _ in range(4):
+        due_at = following_due_date(31, due_at)
+        schedule.append(due_at)
+    
+    assert schedule == [datetime(2026, 2, 28), datetime(2026, 3, 31), datetime(2026, 4, 30), datetime(2026, 5, 31)]
+
+def test_following_due_date_for_days_29_and_30_around_february():
+    assert following_due_date(29, datetime(2026, 1, 29)) == datetime(2026, 2, 28)
+    assert following_due_date(29, datetime(2026, 2, 28)) == datetime(2026, 3, 29)
+    assert following_due_date(29, datetime(2028, 1, 29)) == datetime(2028, 2, 29)
+    assert following_due_date(30, datetime(2026, 2, 28)) == datetime(2026, 3, 30)
+
+def test_following_due_date_crosses_the_year():
+    assert following_due_date(15, datetime(2026, 12, 15)) == datetime(2027, 1, 15)
+
+def test_split_message_keeps_short_digests_in_one_message():
+    assert split_message("Header", ["a", "b"]) == ["Header\n\na\n\nb"]
+
+def test_split_message_respects_the_limit_and_repeats_the_header():
+    items = [f"item {number} " + "x" * 20 for number in range(10)]
+    
+    messages = split_message("Header", items, limit=80)
+    
+    assert len(messages) > 1
+    assert all(len(message) <= 80 for message in messages)
+    assert all(message.startswith("Header\n\n") for message in messages)
+    assert [item for message in messages for item in message.split("\n\n")[1:]] == items
+
+def test_split_message_truncates_an_item_longer_than_a_message():
+    messages = split_message("Header", ["y" * 200], limit=50)
+    
+    assert messages == ["Header\n\n" + "y" * 42]
@@ -0,0 +1,24 @@
+from keyboards.main_keyboards import main_menu_keyboard, payment_confirmation_keyboard, profile_keyboard
+from keyboards.registry import warm_up_keyboards
+
+def test_mutating_a_returned_keyboard_leaves_the_cached_one_intact():
+    keyboard = main_menu_keyboard("uz")
+    rows = len(keyboard.keyboard)
+    
+    keyboard.keyboard.append([])
+    profile = profile_keyboard("uz")
+    profile.inline_keyboard[0][0].text = "changed"
+    
+    assert len(main_menu_keyboard("uz").keyboard) == rows
+    assert profile_keyboard("uz").inline_keyboard[0][0].text != "changed"
+
+def test_cached_keyboards_are_built_once_per_language():
+    warm_up_keyboards()
+    misses = payment_confirmation_keyboard.cache_info().misses
+    
+    first = payment_confirmation_keyboard("uz", "monthly")
+    second = payment_confirmation_keyboard("uz", "monthly")
+    
+    assert payment_confirmation_keyboard.cache_info().misses == misses
+    assert first == second
+    assert first is not second
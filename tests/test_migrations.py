@@ -0,0 +1,32 @@
+import asyncio
+
+from sqlalchemy import text
+
+from database import migrations
+from database.database import engine
+from database.migrations import Migration, run_migrations
+
+async def add_probe_column(conn) -> None:
+    # Not idempotent on purpose: a second run fails with "duplicate column"
+    await asyncio.sleep(0.05)
+    await conn.execute(text("ALTER TABLE migration_probe ADD COLUMN flag INTEGER"))
+
+def test_concurrent_startups_apply_a_migration_once(db, run, monkeypatch):
+    async def scenario():
+        # Creates schema_migrations without applying anything
+        monkeypatch.setattr(migrations, "MIGRATIONS", [])
+        await run_migrations()
+        async with engine.begin() as conn:
+            await conn.execute(text("DELETE FROM schema_migrations WHERE version = 1000"))
+            await conn.execute(text("DROP TABLE IF EXISTS migration_probe"))
+            await conn.execute(text("CREATE TABLE migration_probe (id INTEGER PRIMARY KEY)"))
+        
+        # Both bots starting at once
+        monkeypatch.setattr(migrations, "MIGRATIONS", [Migration(1000, "probe", add_probe_column)])
+        await asyncio.gather(run_migrations(), run_migrations())
+        
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT count(*) FROM schema_migrations WHERE version = 1000"))
+            return result.scalar()
+    
+    assert run(scenario()) == 1
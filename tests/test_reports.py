@@ -0,0 +1,32 @@
+from database.database import DatabaseService
+from services.report_service import ReportService
+from factories import create_landlord_with_tenant
+
+async def pay_and_roll_over():
+    tenant = await create_landlord_with_tenant(rent_due_date=2)
+    await DatabaseService.update_tenant_payment_status(tenant.id, "paid")
+    rolled = await DatabaseService.roll_over_billing_bucket(2, tenant.next_period_due_at)
+    return tenant, rolled
+
+def test_monthly_report_keeps_income_of_rolled_over_periods(db, run):
+    async def scenario():
+        tenant, rolled = await pay_and_roll_over()
+        return rolled, await ReportService.generate_monthly_report(tenant.landlord_id)
+    
+    rolled, report = run(scenario())
+    
+    assert rolled == 1
+    assert report["total_income"] == 1_000_000.0
+    assert report["paid_tenants"] == 1
+    assert report["total_tenants"] == 1
+    assert report["payment_rate"] == 100
+
+def test_yearly_report_keeps_income_of_rolled_over_periods(db, run):
+    async def scenario():
+        tenant, rolled = await pay_and_roll_over()
+        return await ReportService.generate_yearly_report(tenant.landlord_id)
+    
+    report = run(scenario())
+    
+    assert report["total_income"] == 1_000_000.0
+    assert sum(report["monthly_breakdown"].values()) == 1_000_000.0
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from services.send_dispatcher import TokenBucket
+
+def test_bucket_allows_a_burst_up_to_its_capacity():
+    async def scenario():
+        bucket = TokenBucket(rate=5, capacity=3)
+        started = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        burst = time.monotonic() - started
+        await bucket.acquire()
+        return burst, time.monotonic() - started
+    
+    burst, total = asyncio.run(scenario())
+    
+    assert burst < 0.1
+    assert total >= 0.15
+
+def test_retry_after_pauses_senders_and_halves_the_rate():
+    async def scenario():
+        bucket = TokenBucket(rate=20)
+        bucket.on_retry_after(0.1)
+        started = time.monotonic()
+        await bucket.acquire()
+        return bucket.rate, time.monotonic() - started
+    
+    rate, waited = asyncio.run(scenario())
+    
+    assert rate == 10
+    assert waited >= 0.1
+
+def test_rate_never_drops_below_one_and_recovers_to_the_maximum():
+    bucket = TokenBucket(rate=2)
+    for _ in range(5):
+        bucket.on_retry_after(0)
+    assert bucket.rate == 1.0
+    
+    for _ in range(20):
+        bucket.on_success()
+    assert bucket.rate == 2
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+from aiogram.types import InlineKeyboardMarkup
+
+from database.database import DatabaseService
+from factories import create_landlord_with_tenant
+from handlers.tenant_handlers import refresh_tenants_page, render_tenants_page
+
+class StubBot:
+    def __init__(self):
+        self.edits = []
+    
+    async def edit_message_text(self, text, **kwargs):
+        self.edits.append((text, kwargs))
+
+def make_message(bot: StubBot) -> SimpleNamespace:
+    return SimpleNamespace(bot=bot, chat=SimpleNamespace(id=1), message_id=10)
+
+def test_unchanged_page_is_not_edited(db, run):
+    bot = StubBot()
+    
+    async def scenario():
+        tenant = await create_landlord_with_tenant()
+        user = await DatabaseService.get_user_by_id(tenant.landlord_id)
+        text, markup = await render_tenants_page(user)
+        await refresh_tenants_page(make_message(bot), user, 1, current_text=text, current_markup=markup)
+    
+    run(scenario())
+    
+    assert bot.edits == []
+
+def test_changed_keyboard_is_edited_even_when_the_text_matches(db, run):
+    bot = StubBot()
+    
+    async def scenario():
+        tenant = await create_landlord_with_tenant()
+        user = await DatabaseService.get_user_by_id(tenant.landlord_id)
+        text, markup = await render_tenants_page(user)
+        stale_markup = InlineKeyboardMarkup(inline_keyboard=markup.inline_keyboard[:1])
+        await refresh_tenants_page(
+            make_message(bot), user, 1, message_id=7, current_text=text, current_markup=stale_markup
+        )
+        return markup
+    
+    markup = run(scenario())
+    
+    assert len(bot.edits) == 1
+    assert bot.edits[0][1]["message_id"] == 7
+    assert bot.edits[0][1]["reply_markup"] == markup
+
+def test_payment_edit_sends_the_rebuilt_page(db, run):
+    bot = StubBot()
+    
+    async def scenario():
+        tenant = await create_landlord_with_tenant()
+        user = await DatabaseService.get_user_by_id(tenant.landlord_id)
+        text, markup = await render_tenants_page(user)
+        await DatabaseService.update_tenant_payment_status(tenant.id, "paid")
+        await refresh_tenants_page(make_message(bot), user, 1, current_text=text, current_markup=markup)
+        return text, await render_tenants_page(user)
+    
+    old_text, (new_text, new_markup) = run(scenario())
+    
+    assert new_text != old_text
+    assert bot.edits == [(new_text, {"chat_id": 1, "message_id": 10, "reply_markup": new_markup})]
@@ -0,0 +1,33 @@
+from database.database import DatabaseService
+from factories import create_landlord_with_tenant, load_tenant
+
+def test_paid_then_not_paid_restores_the_balance(db, run):
+    async def scenario():
+        tenant = await create_landlord_with_tenant()
+        await DatabaseService.update_tenant_payment_status(tenant.id, "paid")
+        paid = await load_tenant(tenant.id)
+        await DatabaseService.update_tenant_payment_status(tenant.id, "overdue")
+        return tenant, paid, await load_tenant(tenant.id)
+    
+    created, paid, corrected = run(scenario())
+    
+    assert paid.amount_paid == paid.amount_due
+    assert paid.next_due_at == created.next_period_due_at
+    assert corrected.payment_status == "overdue"
+    assert corrected.amount_paid == 0.0
+    assert corrected.amount_due - corrected.amount_paid == 1_000_000.0
+    assert corrected.next_due_at == created.period_due_at
+    assert corrected.overdue_since is not None
+
+def test_partial_amount_replaces_an_earlier_full_payment(db, run):
+    async def scenario():
+        tenant = await create_landlord_with_tenant()
+        await DatabaseService.update_tenant_payment_status(tenant.id, "paid")
+        await DatabaseService.update_tenant_payment_status(tenant.id, "partial", 250_000.0)
+        return await load_tenant(tenant.id)
+    
+    tenant = run(scenario())
+    
+    assert tenant.payment_status == "partial"
+    assert tenant.amount_paid == 250_000.0
+    assert tenant.next_due_at == tenant.period_due_at
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from database.database import DatabaseService, engine, unit_of_work
+from middlewares.unit_of_work import CommitBeforeRequestMiddleware
+
+def test_telegram_calls_run_without_a_checked_out_connection(db, run):
+    checked_out = []
+    
+    async def make_request(bot, method):
+        checked_out.append(engine.sync_engine.pool.checkedout())
+        return "sent"
+    
+    async def scenario():
+        async with unit_of_work():
+            await DatabaseService.create_user(700201, "uz")
+            response = await CommitBeforeRequestMiddleware()(make_request, None, None)
+            await DatabaseService.update_user(700201, language="ru")
+        return response
+    
+    assert run(scenario()) == "sent"
+    assert checked_out == [0]
+
+def test_failure_after_a_telegram_call_keeps_the_earlier_writes(db, run):
+    async def make_request(bot, method):
+        return "sent"
+    
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with unit_of_work():
+                await DatabaseService.create_user(700202, "uz")
+                await CommitBeforeRequestMiddleware()(make_request, None, None)
+                await DatabaseService.update_user(700202, language="ru")
+                raise RuntimeError("handler failed")
+        return await DatabaseService.get_user_by_telegram_id(700202)
+    
+    user = run(scenario())
+    
+    assert user is not None
+    assert user.language == "uz"
+
+def test_pool_serves_a_burst_of_concurrent_updates(db, run):
+    concurrent = 20
+    
+    async def update(barrier):
+        async with unit_of_work():
+            await DatabaseService.count_users(use_cache=False)
+            # Every update holds its connection until all of them have one
+            await barrier.wait()
+    
+    async def scenario():
+        barrier = asyncio.Barrier(concurrent)
+        await asyncio.wait_for(asyncio.gather(*(update(barrier) for _ in range(concurrent))), timeout=10)
+    
+    run(scenario())
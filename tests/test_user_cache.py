@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from database import cache as cache_module
+from database.cache import UserCache
+from database.database import DatabaseService, get_session, user_cache
+from database.models import User
+from services.user_cache_sync import UserCacheSync
+
+async def approve_elsewhere(user_id: int) -> None:
+    """Write premium the way another process would, without touching this cache"""
+    async with get_session() as session:
+        await session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(is_premium=True, premium_expires_at=datetime.utcnow() + timedelta(days=30))
+        )
+
+def test_sync_drops_users_changed_by_another_process(db, run):
+    async def scenario():
+        user = await DatabaseService.create_user(700101, "uz")
+        sync = UserCacheSync(interval=5)
+        await DatabaseService.get_user_by_telegram_id(user.telegram_id)
+        await approve_elsewhere(user.id)
+        stale = await DatabaseService.get_user_by_telegram_id(user.telegram_id)
+        await sync.sync_once()
+        fresh = await DatabaseService.get_user_by_telegram_id(user.telegram_id)
+        return stale, fresh
+    
+    stale, fresh = run(scenario())
+    
+    assert stale.is_premium is False
+    assert fresh.is_premium is True
+
+def test_premium_check_bypasses_the_cache(db, run):
+    async def scenario():
+        user = await DatabaseService.create_user(700102, "uz")
+        await approve_elsewhere(user.id)
+        cached = await DatabaseService.get_user_by_telegram_id(user.telegram_id)
+        return cached.is_premium, await DatabaseService.is_premium_active(user.id)
+    
+    cached_premium, premium = run(scenario())
+    
+    assert cached_premium is False
+    assert premium is True
+
+def test_sync_leaves_unchanged_users_cached(db, run):
+    async def scenario():
+        user = await DatabaseService.create_user(700103, "uz")
+        sync = UserCacheSync(interval=5)
+        sync._checked_at = datetime.utcnow() + timedelta(seconds=10)
+        await sync.sync_once()
+        return user
+    
+    user = run(scenario())
+    
+    assert user_cache.get(user.telegram_id) is not None
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+def make_user(user_id: int, telegram_id: int) -> User:
+    return User(id=user_id, telegram_id=telegram_id, language="uz")
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = UserCache(maxsize=10, ttl=60)
+    cache.put(make_user(1, 101))
+    
+    clock.now += 59
+    assert cache.get(101) is not None
+    clock.now += 2
+    assert cache.get(101) is None
+    
+    cache.invalidate_user_id(1)
+    assert cache.stats()["size"] == 0
+
+def test_least_recently_used_entry_is_evicted_with_its_reverse_entry():
+    cache = UserCache(maxsize=2, ttl=60)
+    cache.put(make_user(1, 101))
+    cache.put(make_user(2, 102))
+    cache.get(101)
+    cache.put(make_user(3, 103))
+    
+    assert cache.get(102) is None
+    assert cache.get(101) is not None
+    assert cache.stats()["evictions"] == 1
+    assert sorted(cache._telegram_ids) == [1, 3]
+
+def test_invalidate_by_user_id_drops_the_telegram_entry():
+    cache = UserCache(maxsize=10, ttl=60)
+    cache.put(make_user(1, 101))
+    
+    cache.invalidate_user_id(1)
+    
+    assert cache.get(101) is None
+    assert cache._telegram_ids == {}
+
+def test_reverse_index_stays_bounded_by_maxsize():
+    cache = UserCache(maxsize=3, ttl=60)
+    for user_id in range(1, 50):
+        cache.put(make_user(user_id, 100 + user_id))
+    
+    assert len(cache._telegram_ids) == 3
@@ -1,4 +1,5 @@
-from datetime import datetime
+import calendar
+from datetime import datetime, timedelta
 from typing import List, Optional, Any
 from database.models import User, Property, Tenant, PremiumRequest
 from localization.translations import get_text
@@ -59,59 +60,72 @@ def format_property_list(properties: List[Property], language: str) -> str:
     
     return text
 
-def format_tenant_list_with_properties(tenant_property_pairs: List, language: str) -> str:
-    """Format tenants list with property information"""
+def format_tenant_list_with_properties(tenant_property_pairs: List, language: str,
+                                       start: int = 1, total: int = None) -> str:
+    """Format tenants list with property information
+    
+    For a page of the list, start is the number of its first tenant and
+    total the number of tenants on all pages.
+    """
+    total = total if total is not None else len(tenant_property_pairs)
     if language == "uz":
-        text = f"👥 Mening ijarachilarim ({len(tenant_property_pairs)} ta):\n\n"
+        text = f"👥 Mening ijarachilarim ({total} ta):\n\n"
     else:
-        text = f"👥 Мои арендаторы ({len(tenant_property_pairs)} шт.):\n\n"
+        text = f"👥 Мои арендаторы ({total} шт.):\n\n"
     
-    for i, (tenant, property_obj) in enumerate(tenant_property_pairs, 1):
-        # Format payment status
-        status_icons = {
-            "paid": "✅",
-            "pending": "⏳",
-            "partial": "⚠️",
-            "overdue": "❌"
-        }
-        
-        status_icon = status_icons.get(tenant.payment_status, "⏳")
-        
-        # Calculate days until/past due date
-        current_date = datetime.now()
-        current_day = current_date.day
-        due_date = tenant.rent_due_date
-        
-        if current_day <= due_date:
-            days_left = due_date - current_day
-            if language == "uz":
-                due_text = f"📅 {days_left} kun qoldi"
-            else:
-                due_text = f"📅 {days_left} дней осталось"
+    for i, (tenant, property_obj) in enumerate(tenant_property_pairs, start):
+        text += format_tenant_entry(tenant, property_obj, language, i) + "\n\n"
+    
+    return text
+
+def format_tenant_entry(tenant: Tenant, property_obj: Property, language: str, number: int) -> str:
+    """Format one numbered tenant block of the tenants list"""
+    # Format payment status
+    status_icons = {
+        "paid": "✅",
+        "pending": "⏳",
+        "partial": "⚠️",
+        "overdue": "❌"
+    }
+    
+    status_icon = status_icons.get(tenant.payment_status, "⏳")
+    
+    # Calculate days until/past due date
+    current_date = datetime.now()
+    if tenant.next_due_at:
+        days_left = (tenant.next_due_at.date() - current_date.date()).days
+    else:
+        days_left = tenant.rent_due_date - current_date.day
+    
+    if days_left >= 0:
+        if language == "uz":
+            due_text = f"📅 {days_left} kun qoldi"
         else:
-            days_overdue = current_day - due_date
-            if language == "uz":
-                due_text = f"⚠️ {days_overdue} kun kechikdi"
-            else:
-                due_text = f"⚠️ {days_overdue} дней просрочено"
-        
-        # Property address (short form)
-        property_name = property_obj.address[:30] + "..." if len(property_obj.address) > 30 else property_obj.address
-        
+            due_text = f"📅 {days_left} дней осталось"
+    else:
+        days_overdue = -days_left
         if language == "uz":
-            text += f"{i}. 👤 {tenant.full_name}\n"
-            text += f"   📋 {tenant.passport_series}{tenant.passport_number}\n"
-            text += f"   🏠 {property_name}\n"
-            text += f"   📅 Kirgan: {tenant.move_in_date.strftime('%d.%m.%Y')}\n"
-            text += f"   💰 Holat: {status_icon}\n"
-            text += f"   {due_text}\n\n"
+            due_text = f"⚠️ {days_overdue} kun kechikdi"
         else:
-            text += f"{i}. 👤 {tenant.full_name}\n"
-            text += f"   📋 {tenant.passport_series}{tenant.passport_number}\n"
-            text += f"   🏠 {property_name}\n"
-            text += f"   📅 Заселился: {tenant.move_in_date.strftime('%d.%m.%Y')}\n"
-            text += f"   💰 Статус: {status_icon}\n"
-            text += f"   {due_text}\n\n"
+            due_text = f"⚠️ {days_overdue} дней просрочено"
+    
+    # Property address (short form)
+    property_name = property_obj.address[:30] + "..." if len(property_obj.address) > 30 else property_obj.address
+    
+    if language == "uz":
+        text = f"{number}. 👤 {tenant.full_name}\n"
+        text += f"   📋 {tenant.passport_series}{tenant.passport_number}\n"
+        text += f"   🏠 {property_name}\n"
+        text += f"   📅 Kirgan: {tenant.move_in_date.strftime('%d.%m.%Y')}\n"
+        text += f"   💰 Holat: {status_icon}\n"
+        text += f"   {due_text}"
+    else:
+        text = f"{number}. 👤 {tenant.full_name}\n"
+        text += f"   📋 {tenant.passport_series}{tenant.passport_number}\n"
+        text += f"   🏠 {property_name}\n"
+        text += f"   📅 Заселился: {tenant.move_in_date.strftime('%d.%m.%Y')}\n"
+        text += f"   💰 Статус: {status_icon}\n"
+        text += f"   {due_text}"
     
     return text
 
@@ -245,6 +259,21 @@ Tasdiqlaysizmi?"""
     
     return text
 
+def split_message(header: str, items: List[str], limit: int = 4096) -> List[str]:
+    """Pack header and items into as few messages as fit Telegram's length limit"""
+    messages = []
+    current = header
+    
+    for item in items:
+        item = item[:limit - len(header) - 2]
+        if len(current) + 2 + len(item) > limit:
+            messages.append(current)
+            current = header
+        current += "\n\n" + item
+    
+    messages.append(current)
+    return messages
+
 def is_valid_number(text: str) -> bool:
     """Check if text is a valid number"""
     try:
@@ -261,6 +290,22 @@ def is_valid_day(text: str) -> bool:
     except ValueError:
         return False
 
+def due_date_in_month(year: int, month: int, day: int) -> datetime:
+    """Rent due date in a month, clamped to its last day (e.g. 31 -> 28 Feb)"""
+    return datetime(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+def first_due_date(day: int, on_or_after: datetime) -> datetime:
+    """First rent due date for a due day falling on or after the given date"""
+    due = due_date_in_month(on_or_after.year, on_or_after.month, day)
+    if due.date() >= on_or_after.date():
+        return due
+    year, month = divmod(on_or_after.month, 12)
+    return due_date_in_month(on_or_after.year + year, month + 1, day)
+
+def following_due_date(day: int, due_at: datetime) -> datetime:
+    """Due date of the billing period after the one due at due_at"""
+    return first_due_date(day, due_at + timedelta(days=1))
+
 def parse_date(date_string: str) -> Optional[datetime]:
     """Parse date string in DD.MM.YYYY format"""
     try: